@@ -19,6 +19,8 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.syntax import Syntax
 from rich.prompt import Prompt, Confirm
 
+from infranest_dsl import check_size, load_dsl_file
+
 console = Console()
 
 # Configuration
@@ -91,25 +93,29 @@ class InfraNestCopilot:
         
         return dsl
     
-    def preview_code(self, dsl_file: str, framework: str = "django") -> Dict[str, Any]:
+    def preview_code(self, dsl_file: str, framework: Optional[str] = None) -> Dict[str, Any]:
         """Preview generated code structure"""
-        with open(dsl_file, 'r') as f:
-            dsl = yaml.safe_load(f)
+        # Send the raw YAML; the API parses it (and multi-document batches) itself
+        check_size(Path(dsl_file).stat().st_size)
+        yaml_body = Path(dsl_file).read_bytes()
         
-        console.print(f"[blue]Previewing {framework} code structure...[/blue]")
+        # Without a framework the API uses each document's meta.framework
+        params = {"framework": framework} if framework else {}
+        console.print(f"[blue]Previewing {framework or 'meta.framework'} code structure...[/blue]")
         
         response = self.api_request(
             "POST",
             "/preview-code",
-            json={"dsl": dsl, "framework": framework}
+            data=yaml_body,
+            params=params,
+            headers={"Content-Type": "application/x-yaml"}
         )
         
         return response.json()
     
     def deploy_project(self, dsl_file: str, provider: str = "railway") -> Dict[str, Any]:
         """Deploy project to cloud provider"""
-        with open(dsl_file, 'r') as f:
-            dsl = yaml.safe_load(f)
+        dsl = load_dsl_file(dsl_file)
         
         console.print(f"[blue]Deploying to {provider}...[/blue]")
         
@@ -156,8 +162,7 @@ class InfraNestCopilot:
     
     def run_audit(self, dsl_file: str) -> Dict[str, Any]:
         """Run security and performance audit"""
-        with open(dsl_file, 'r') as f:
-            dsl = yaml.safe_load(f)
+        dsl = load_dsl_file(dsl_file)
         
         console.print("[blue]Running security and performance audit...[/blue]")
         
@@ -190,8 +195,7 @@ class InfraNestCopilot:
     
     def simulate_api(self, dsl_file: str, endpoint: str, method: str = "GET") -> Dict[str, Any]:
         """Simulate API endpoint responses"""
-        with open(dsl_file, 'r') as f:
-            dsl = yaml.safe_load(f)
+        dsl = load_dsl_file(dsl_file)
         
         console.print(f"[blue]Simulating {method} {endpoint}...[/blue]")
         
@@ -257,7 +261,7 @@ def describe_backend(ctx, description, output):
 
 @cli.command()
 @click.argument('dsl_file', type=click.Path(exists=True))
-@click.option('--framework', '-f', default='django', help='Target framework')
+@click.option('--framework', '-f', default=None, help='Target framework (default: meta.framework of the DSL)')
 @click.pass_context
 def preview_code(ctx, dsl_file, framework):
     """Preview generated code structure"""
@@ -266,19 +270,22 @@ def preview_code(ctx, dsl_file, framework):
     try:
         result = copilot.preview_code(dsl_file, framework)
         
-        table = Table(title=f"Code Structure - {framework.title()}")
-        table.add_column("File", style="cyan")
-        table.add_column("Type", style="magenta")
-        table.add_column("Description", style="green")
-        
-        for file_info in result.get('preview', {}).get('files', []):
-            table.add_row(
-                file_info.get('path', ''),
-                file_info.get('type', ''),
-                file_info.get('description', '')
-            )
-        
-        console.print(table)
+        # Multi-document DSL files come back as a batch of previews
+        for project in result.get('previews', [result]):
+            project_framework = project.get('framework') or framework or ''
+            table = Table(title=f"Code Structure - {project.get('project_name', '')} ({project_framework.title()})")
+            table.add_column("File", style="cyan")
+            table.add_column("Type", style="magenta")
+            table.add_column("Description", style="green")
+            
+            for file_info in project.get('preview', {}).get('files', []):
+                table.add_row(
+                    file_info.get('path', ''),
+                    file_info.get('type', ''),
+                    file_info.get('description', '')
+                )
+            
+            console.print(table)
     
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
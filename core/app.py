@@ -3,20 +3,34 @@ InfraNest Core Generation Engine
 Flask-based API for DSL parsing and code generation
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 import yaml
 import os
+import hashlib
 import tempfile
+import threading
 import zipfile
+import json
+from collections import OrderedDict
+from concurrent.futures import TimeoutError as FormatTimeoutError
 from datetime import datetime
 import logging
 
-from generators.django_generator import DjangoGenerator
-from generators.go_generator import GoGenerator
-from generators.rails_generator import RailsGenerator
+from infranest_dsl import MAX_BYTES, YAML_MIMETYPES, DSLLoadError, DSLTooLargeError, check_size, load_dsl_documents
+from generators.base import file_type, spec_digest
+from generators.budget import BudgetExceeded, RenderBudget, current_budget
+from generators.registry import GeneratorUnavailable, registry as generator_registry
+from generators.loadtest_generator import LoadTestGenerator
+from generators.formatting import formatter_pool
 from parsers.dsl_parser import DSLParser
 from parsers.agentic_parser import AgenticParser
+from werkzeug.exceptions import RequestEntityTooLarge
+
+try:
+    import redis
+except ImportError:
+    redis = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,12 +39,27 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
-# Initialize generators
-generators = {
-    'django': DjangoGenerator(),
-    'go-fiber': GoGenerator(),
-    'rails': RailsGenerator()
-}
+# Backstop for bodies without a Content-Length (e.g. chunked uploads)
+app.config['MAX_CONTENT_LENGTH'] = MAX_BYTES
+
+# Generators are imported on first use; optionally warm some up at boot
+# (INFRANEST_WARM_GENERATORS=all or a comma-separated list of framework ids).
+# Formatter workers re-import this module as __mp_main__ and must not warm up.
+warm_generators = os.environ.get('INFRANEST_WARM_GENERATORS', '')
+if warm_generators and __name__ != '__mp_main__':
+    generator_registry.warm_up(None if warm_generators == 'all' else warm_generators.split(','))
+    formatter_pool.warm_up()
+loadtest_generator = LoadTestGenerator()
+
+# Parsed projects behind manifest previews, so single files can be fetched lazily
+preview_sessions = OrderedDict()
+preview_sessions_lock = threading.Lock()
+PREVIEW_SESSIONS = int(os.environ.get('INFRANEST_PREVIEW_SESSIONS', 32))
+
+# Shared by all workers when Redis is configured; the in-process LRU then only caches parsed specs
+PREVIEW_REDIS_URL = os.environ.get('INFRANEST_PREVIEW_REDIS_URL', os.environ.get('REDIS_URL', ''))
+PREVIEW_TTL = int(os.environ.get('INFRANEST_PREVIEW_TTL', 3600))
+preview_store = redis.Redis.from_url(PREVIEW_REDIS_URL, socket_timeout=1) if PREVIEW_REDIS_URL and redis else None
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -64,22 +93,188 @@ def parse_prompt():
         logger.error(f"Error parsing prompt: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+def read_dsl_request():
+    """Read DSL documents and options from a JSON body or a raw YAML body
+    
+    Raw YAML may hold several documents, which are processed as a batch;
+    options then come from the query string.
+    """
+    # Reject oversized bodies, YAML or JSON, before reading them
+    check_size(request.content_length or 0)
+    try:
+        if request.mimetype in YAML_MIMETYPES:
+            return load_dsl_documents(request.get_data()), request.args
+        
+        data = request.get_json()
+    except RequestEntityTooLarge as e:
+        raise DSLTooLargeError(f"DSL input exceeds the limit of {MAX_BYTES} bytes") from e
+    return [data.get('dsl', {})], data
+
+def option_enabled(options, name, default=True):
+    """Read a boolean option from JSON or query-string values"""
+    value = options.get(name, default)
+    if isinstance(value, str):
+        return value.lower() not in ('0', 'false', 'no', 'off')
+    return bool(value)
+
+def resolve_framework(options, dsl_spec):
+    """Framework from the request, falling back to the DSL's meta section"""
+    return options.get('framework') or dsl_spec.get('meta', {}).get('framework', 'django')
+
+def generate_project_files(dsl_spec, framework, include_loadtest, format_code=True):
+    """Parse one DSL document and generate its files"""
+    # Parse and validate DSL into the IR shared by all generators
+    parser = DSLParser(frameworks=generator_registry.ids())
+    parsed_spec = parser.parse_project(dsl_spec)
+    
+    # Generate code
+    generator = generator_registry.get(framework)
+    generated_files = generator.generate(parsed_spec)
+    
+    # Add the load-test harness unless explicitly disabled
+    if include_loadtest:
+        generated_files.update(loadtest_generator.generate(parsed_spec))
+    
+    # Format generated Python (cached by content hash across requests)
+    if format_code:
+        generated_files = format_files_within_budget(generated_files)
+    
+    return parsed_spec, generated_files
+
+def format_files_within_budget(files):
+    """Format generated Python in the time left to the current render budget"""
+    budget = current_budget()
+    if budget is None:
+        return formatter_pool.format_files(files)
+    
+    budget.check()
+    try:
+        return formatter_pool.format_files(files, timeout=budget.remaining())
+    except FormatTimeoutError as e:
+        raise budget.deadline_exceeded() from e
+
+def project_generators(framework, include_loadtest):
+    """Generators contributing files to a project"""
+    generators = [generator_registry.get(framework)]
+    if include_loadtest:
+        generators.append(loadtest_generator)
+    return generators
+
+def generator_manifest(generator, parsed_spec, digest):
+    """File manifest of one generator; generators without manifest support are rendered"""
+    if hasattr(generator, 'manifest'):
+        return generator.manifest(parsed_spec, digest)
+    
+    return [
+        {
+            'path': path,
+            'type': file_type(path),
+            'hash': hashlib.sha256(content.encode()).hexdigest(),
+            'estimated_size': len(content.encode()),
+            'size_exact': True
+        }
+        for path, content in generator.generate(parsed_spec).items()
+    ]
+
+def cache_preview_session(preview_id, session):
+    with preview_sessions_lock:
+        preview_sessions[preview_id] = session
+        preview_sessions.move_to_end(preview_id)
+        while len(preview_sessions) > PREVIEW_SESSIONS:
+            preview_sessions.popitem(last=False)
+
+def save_preview_session(preview_id, dsl_spec, session):
+    """Register a manifest preview locally and, when configured, in the shared store"""
+    cache_preview_session(preview_id, session)
+    if preview_store is None:
+        return
+    
+    _, _, framework, include_loadtest, format_code = session
+    stored = json.dumps({
+        'spec': yaml.safe_dump(dsl_spec, sort_keys=False),
+        'framework': framework,
+        'include_loadtest': include_loadtest,
+        'format_code': format_code
+    })
+    try:
+        preview_store.set(f'infranest:preview:{preview_id}', stored, ex=PREVIEW_TTL)
+    except redis.RedisError as e:
+        logger.warning(f"Preview session not shared: {str(e)}")
+
+def load_preview_session(preview_id):
+    """Session of a manifest preview, re-parsed from the shared store if another worker built it"""
+    with preview_sessions_lock:
+        session = preview_sessions.get(preview_id)
+        if session is not None:
+            preview_sessions.move_to_end(preview_id)
+            return session
+    if preview_store is None:
+        return None
+    
+    try:
+        stored = preview_store.get(f'infranest:preview:{preview_id}')
+    except redis.RedisError as e:
+        logger.warning(f"Preview session store unavailable: {str(e)}")
+        return None
+    if stored is None:
+        return None
+    
+    stored = json.loads(stored)
+    parsed_spec = DSLParser(frameworks=generator_registry.ids()).parse_project(yaml.safe_load(stored['spec']))
+    session = (parsed_spec, spec_digest(parsed_spec), stored['framework'],
+               stored['include_loadtest'], stored['format_code'])
+    cache_preview_session(preview_id, session)
+    return session
+
+def build_manifest(dsl_spec, parsed_spec, framework, include_loadtest, format_code):
+    """Manifest of every generated file, registered for per-file retrieval"""
+    digest = spec_digest(parsed_spec)
+    preview_id = hashlib.sha256(
+        f"{digest}\0{framework}\0{include_loadtest}\0{format_code}".encode()
+    ).hexdigest()[:32]
+    
+    files = []
+    for generator in project_generators(framework, include_loadtest):
+        for entry in generator_manifest(generator, parsed_spec, digest):
+            if format_code:
+                entry['hash'] = formatter_pool.formatted_hash(entry['path'], entry['hash'])
+            entry['url'] = f"/api/v1/preview-file/{preview_id}/{entry['path']}"
+            files.append(entry)
+    
+    save_preview_session(preview_id, dsl_spec, (parsed_spec, digest, framework, include_loadtest, format_code))
+    
+    return {
+        'preview_id': preview_id,
+        'files': files,
+        'estimated_size': sum(entry['estimated_size'] for entry in files)
+    }
+
 @app.route('/api/v1/validate-dsl', methods=['POST'])
 def validate_dsl():
     """Validate DSL specification"""
     try:
-        data = request.get_json()
-        dsl_spec = data.get('dsl', {})
+        documents, _ = read_dsl_request()
+        
+        parser = DSLParser(frameworks=generator_registry.ids())
+        results = []
+        for dsl_spec in documents:
+            validation_result = parser.validate(dsl_spec)
+            results.append({
+                'valid': validation_result['valid'],
+                'errors': validation_result.get('errors', []),
+                'warnings': validation_result.get('warnings', [])
+            })
         
-        parser = DSLParser()
-        validation_result = parser.validate(dsl_spec)
+        if len(results) == 1:
+            return jsonify(results[0])
         
         return jsonify({
-            'valid': validation_result['valid'],
-            'errors': validation_result.get('errors', []),
-            'warnings': validation_result.get('warnings', [])
+            'valid': all(result['valid'] for result in results),
+            'results': results
         })
         
+    except DSLLoadError as e:
+        return jsonify({'error': str(e)}), e.status_code
     except Exception as e:
         logger.error(f"Error validating DSL: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -88,34 +283,49 @@ def validate_dsl():
 def generate_code():
     """Generate backend code from DSL specification"""
     try:
-        data = request.get_json()
-        dsl_spec = data.get('dsl', {})
-        framework = data.get('framework', 'django')
+        documents, options = read_dsl_request()
+        include_loadtest = option_enabled(options, 'include_loadtest')
+        format_code = option_enabled(options, 'format')
+        batch = len(documents) > 1
         
-        if framework not in generators:
-            return jsonify({'error': f'Unsupported framework: {framework}'}), 400
+        # One deadline and output cap for everything generated by this request
+        projects = []
+        with RenderBudget():
+            for dsl_spec in documents:
+                framework = resolve_framework(options, dsl_spec)
+                if framework not in generator_registry:
+                    return jsonify({'error': f'Unsupported framework: {framework}'}), 400
+                parsed_spec, generated_files = generate_project_files(dsl_spec, framework, include_loadtest, format_code)
+                projects.append((parsed_spec, framework, generated_files))
         
-        # Parse and validate DSL
-        parser = DSLParser()
-        parsed_spec = parser.parse(dsl_spec)
-        
-        # Generate code
-        generator = generators[framework]
-        generated_files = generator.generate(parsed_spec)
-        
-        # Create zip file
+        # Create zip file; batches get one folder per project
         with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as tmp_file:
             with zipfile.ZipFile(tmp_file.name, 'w') as zip_file:
-                for file_path, content in generated_files.items():
-                    zip_file.writestr(file_path, content)
+                for parsed_spec, framework, generated_files in projects:
+                    prefix = f"{parsed_spec.name}-{framework}/" if batch else ''
+                    for file_path, content in generated_files.items():
+                        zip_file.writestr(prefix + file_path, content)
+            
+            if batch:
+                download_name = f"infranest-batch-{len(projects)}.zip"
+            else:
+                download_name = f"{projects[0][0].name}-{projects[0][1]}.zip"
             
             return send_file(
                 tmp_file.name,
                 as_attachment=True,
-                download_name=f"{parsed_spec.get('meta', {}).get('name', 'project')}-{framework}.zip",
+                download_name=download_name,
                 mimetype='application/zip'
             )
             
+    except DSLLoadError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    except BudgetExceeded as e:
+        logger.warning(f"Code generation over budget: {str(e)}")
+        return jsonify({'error': str(e)}), e.status_code
+    except GeneratorUnavailable as e:
+        logger.error(f"Error generating code: {str(e)}")
+        return jsonify({'error': str(e)}), e.status_code
     except Exception as e:
         logger.error(f"Error generating code: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -124,58 +334,115 @@ def generate_code():
 def preview_code():
     """Preview generated code structure without downloading"""
     try:
-        data = request.get_json()
-        dsl_spec = data.get('dsl', {})
-        framework = data.get('framework', 'django')
-        
-        if framework not in generators:
-            return jsonify({'error': f'Unsupported framework: {framework}'}), 400
+        documents, options = read_dsl_request()
+        include_loadtest = option_enabled(options, 'include_loadtest')
+        manifest_only = option_enabled(options, 'manifest', False)
+        format_code = option_enabled(options, 'format')
         
-        # Parse DSL
-        parser = DSLParser()
-        parsed_spec = parser.parse(dsl_spec)
+        previews = []
+        with RenderBudget():
+            for dsl_spec in documents:
+                framework = resolve_framework(options, dsl_spec)
+                if framework not in generator_registry:
+                    return jsonify({'error': f'Unsupported framework: {framework}'}), 400
+                
+                # Parse DSL
+                parser = DSLParser(frameworks=generator_registry.ids())
+                parsed_spec = parser.parse_project(dsl_spec)
+                
+                # Generate preview; manifest mode lists hashes and sizes without rendering
+                if manifest_only:
+                    preview = build_manifest(dsl_spec, parsed_spec, framework, include_loadtest, format_code)
+                else:
+                    generator = generator_registry.get(framework)
+                    preview = generator.preview(parsed_spec)
+                    if include_loadtest:
+                        preview.setdefault('files', []).extend(loadtest_generator.describe_files(parsed_spec))
+                
+                previews.append({
+                    'preview': preview,
+                    'framework': framework,
+                    'project_name': parsed_spec.name
+                })
         
-        # Generate preview
-        generator = generators[framework]
-        preview = generator.preview(parsed_spec)
+        if len(previews) == 1:
+            return jsonify(previews[0])
         
-        return jsonify({
-            'preview': preview,
-            'framework': framework,
-            'project_name': parsed_spec.get('meta', {}).get('name', 'project')
-        })
+        return jsonify({'previews': previews})
         
+    except DSLLoadError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    except BudgetExceeded as e:
+        logger.warning(f"Code preview over budget: {str(e)}")
+        return jsonify({'error': str(e)}), e.status_code
+    except GeneratorUnavailable as e:
+        logger.error(f"Error previewing code: {str(e)}")
+        return jsonify({'error': str(e)}), e.status_code
     except Exception as e:
         logger.error(f"Error previewing code: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/v1/preview-file/<preview_id>/<path:file_path>', methods=['GET'])
+def preview_file(preview_id, file_path):
+    """Render one file of a manifest preview on demand (supports ETag and Range requests)"""
+    try:
+        session = load_preview_session(preview_id)
+        if session is None:
+            return jsonify({'error': 'Unknown or expired preview; request the manifest again'}), 404
+        parsed_spec, digest, framework, include_loadtest, format_code = session
+        
+        for generator in project_generators(framework, include_loadtest):
+            if not hasattr(generator, 'render_file'):
+                content = generator.generate(parsed_spec).get(file_path)
+                if content is None:
+                    continue
+                content_hash = hashlib.sha256(content.encode()).hexdigest()
+                break
+            try:
+                content_hash = generator.path_hash(parsed_spec, file_path, digest)
+            except KeyError:
+                continue
+            content = None
+            break
+        else:
+            return jsonify({'error': f'File not found in preview: {file_path}'}), 404
+        
+        if format_code:
+            content_hash = formatter_pool.formatted_hash(file_path, content_hash)
+        
+        # Unchanged files are answered without rendering
+        if request.if_none_match.contains(content_hash):
+            response = Response(status=304)
+            response.set_etag(content_hash)
+            return response
+        
+        with RenderBudget():
+            if content is None:
+                content = generator.render_file(parsed_spec, file_path, digest)['content']
+            if format_code:
+                content = format_files_within_budget({file_path: content})[file_path]
+        
+        data = content.encode()
+        response = Response(data, mimetype='text/plain')
+        response.set_etag(content_hash)
+        response.headers['X-File-Type'] = file_type(file_path)
+        return response.make_conditional(request, accept_ranges=True, complete_length=len(data))
+        
+    except BudgetExceeded as e:
+        logger.warning(f"Preview file over budget: {str(e)}")
+        return jsonify({'error': str(e)}), e.status_code
+    except GeneratorUnavailable as e:
+        logger.error(f"Error previewing file: {str(e)}")
+        return jsonify({'error': str(e)}), e.status_code
+    except Exception as e:
+        logger.error(f"Error previewing file: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/v1/frameworks', methods=['GET'])
 def get_frameworks():
     """Get list of supported frameworks"""
     return jsonify({
-        'frameworks': [
-            {
-                'id': 'django',
-                'name': 'Django + DRF',
-                'description': 'Python web framework with Django REST Framework',
-                'language': 'Python',
-                'features': ['ORM', 'Admin Panel', 'Authentication', 'REST API']
-            },
-            {
-                'id': 'go-fiber',
-                'name': 'Go Fiber + GORM',
-                'description': 'High-performance Go web framework with GORM ORM',
-                'language': 'Go',
-                'features': ['High Performance', 'ORM', 'Middleware', 'REST API']
-            },
-            {
-                'id': 'rails',
-                'name': 'Ruby on Rails',
-                'description': 'Convention over configuration web framework',
-                'language': 'Ruby',
-                'features': ['ActiveRecord', 'Scaffolding', 'Authentication', 'REST API']
-            }
-        ]
+        'frameworks': generator_registry.metadata()
     })
 
 if __name__ == '__main__':
@@ -0,0 +1,4 @@
+"""
+Benchmarks for InfraNest
+Performance measurements for the DSL parsers and code generators
+"""
@@ -0,0 +1,274 @@
+"""
+Generation Engine Benchmarks for InfraNest
+Times validation, normalization, per-framework rendering, manifests and archiving across DSL sizes
+
+Usage (from the core directory):
+
+    python -m benchmarks.bench_engine                       # run and print results
+    python -m benchmarks.bench_engine --save                # store results as the baseline
+    python -m benchmarks.bench_engine --check               # fail if a stage regressed
+    python -m benchmarks.bench_engine --sizes large --models 500 --fields 30
+
+Baselines live in benchmarks/baselines/engine.json. ``--check`` exits with
+status 1 when any stage's best time exceeds the baseline by more than
+``--threshold`` (default 25%), or when a stage has no baseline entry to
+compare with (a new stage or size, or changed dimensions: re-run with
+``--save``). Stages faster than ``--noise-floor`` in both runs are ignored,
+since their timings are dominated by jitter.
+"""
+
+import argparse
+import copy
+import gc
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Tuple
+
+from parsers.dsl_parser import DEFAULT_LIMITS, DSLParser
+from parsers.agentic_parser import AgenticParser
+from parsers.ir import Project
+from generators.base import BaseGenerator
+from generators.django_templates import DjangoTemplates
+from generators.loadtest_generator import LoadTestGenerator
+from generators.registry import GeneratorUnavailable, registry
+from generators.formatting import formatter_pool
+from benchmarks.synthetic import SIZES, build_spec
+
+BASELINE_FILE = Path(__file__).resolve().parent / 'baselines' / 'engine.json'
+
+# Template sets choosing their own files, by framework
+TEMPLATE_SETS = {'django': DjangoTemplates}
+
+
+class TemplateDirRenderer(BaseGenerator):
+    """Renders every template of a framework directory
+
+    Stand-in used when a framework's generator cannot be loaded, so
+    template rendering cost is still measured.
+    """
+
+    def __init__(self, framework: str):
+        self.template_subdir = framework
+        super().__init__()
+
+
+def load_renderers() -> Dict[str, Any]:
+    """Collect available generators keyed by framework"""
+    renderers = {}
+    for framework in registry.ids():
+        try:
+            renderers[framework] = registry.get(framework)
+        except GeneratorUnavailable:
+            fallback = TEMPLATE_SETS[framework]() if framework in TEMPLATE_SETS else TemplateDirRenderer(framework)
+            if fallback.templates_dir.is_dir():
+                renderers[framework] = fallback
+    renderers['loadtest'] = LoadTestGenerator()
+    return renderers
+
+
+def measure(func: Callable[[], Any], setup: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Time ``func(setup())`` ``repeat`` times, then trace its memory peak once
+
+    The garbage collector is paused while timing, as ``timeit`` does, so
+    collections triggered by earlier stages do not skew the results.
+    """
+    timings = []
+    for _ in range(repeat):
+        args = setup()
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            func(args)
+            timings.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+
+    args = setup()
+    tracemalloc.start()
+    try:
+        func(args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'median_s': round(statistics.median(timings), 6),
+        'min_s': round(min(timings), 6),
+        'peak_kb': round(peak / 1024, 1)
+    }
+
+
+def archive(files: Dict[str, str]) -> bytes:
+    """Zip generated files in memory as generate-code does"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zip_file:
+        for file_path, content in files.items():
+            zip_file.writestr(file_path, content)
+    return buffer.getvalue()
+
+
+def bench_size(dimensions: Dict[str, int], renderers: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """Benchmark every stage for one DSL size"""
+    # Sizes are chosen by the caller; tenant budgets do not apply
+    parser = DSLParser(limits={name: sys.maxsize for name in DEFAULT_LIMITS}, frameworks=registry.ids())
+    spec = build_spec(**dimensions)
+    results = {}
+
+    results['validate'] = measure(parser.validate, lambda: spec, repeat)
+    results['normalize'] = measure(parser._normalize_spec, lambda: copy.deepcopy(spec), repeat)
+
+    normalized = parser.parse(copy.deepcopy(spec))
+    results['build_ir'] = measure(Project.from_spec, lambda: normalized, repeat)
+
+    parsed = Project.from_spec(normalized)
+    for framework, generator in renderers.items():
+        files = generator.generate(parsed)
+        results[f'render:{framework}'] = measure(generator.generate, lambda: parsed, repeat)
+        if hasattr(generator, 'manifest'):
+            results[f'manifest:{framework}'] = measure(generator.manifest, lambda: parsed, repeat)
+        results[f'archive:{framework}'] = measure(archive, lambda: files, repeat)
+        results[f'render:{framework}']['output_kb'] = round(
+            sum(len(content.encode()) for content in files.values()) / 1024, 1
+        )
+
+        # Formatting through the resident pool: cold cache vs. unchanged files
+        if formatter_pool.available:
+            def cold_cache():
+                formatter_pool.clear_cache()
+                return files
+            results[f'format_cold:{framework}'] = measure(formatter_pool.format_files, cold_cache, repeat)
+            results[f'format_warm:{framework}'] = measure(formatter_pool.format_files, lambda: files, repeat)
+
+    return results
+
+
+def run(sizes: Dict[str, Dict[str, int]], repeat: int) -> Dict[str, Any]:
+    """Run all benchmarks and return a JSON-serializable report"""
+    renderers = load_renderers()
+    formatter_pool.warm_up()
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'renderers': sorted(renderers),
+            'formatter': formatter_pool.available
+        },
+        'results': {}
+    }
+
+    prompt = 'A blog API with users, posts, comments and a product store'
+    report['results']['prompt'] = {
+        'dimensions': {},
+        'stages': {'agentic_parse': measure(AgenticParser().parse_prompt, lambda: prompt, repeat)}
+    }
+
+    for name, dimensions in sizes.items():
+        report['results'][name] = {
+            'dimensions': dimensions,
+            'stages': bench_size(dimensions, renderers, repeat)
+        }
+
+    return report
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+            noise_floor: float) -> Tuple[List[Tuple[str, str, float, float]], List[Tuple[str, str]]]:
+    """List (size, stage, baseline, current) for stages slower than the threshold,
+    and (size, stage) for stages without a baseline entry of the same dimensions"""
+    regressions = []
+    missing = []
+    for size, result in report['results'].items():
+        base_result = baseline.get('results', {}).get(size)
+        comparable = base_result and base_result.get('dimensions') == result['dimensions']
+        for stage, timing in result['stages'].items():
+            base_timing = base_result['stages'].get(stage) if comparable else None
+            if not base_timing:
+                missing.append((size, stage))
+                continue
+            before, after = base_timing['min_s'], timing['min_s']
+            if max(before, after) < noise_floor:
+                continue
+            if after > before * (1 + threshold):
+                regressions.append((size, stage, before, after))
+    return regressions, missing
+
+
+def print_report(report: Dict[str, Any]):
+    for size, result in report['results'].items():
+        dimensions = ', '.join(f'{key}={value}' for key, value in result['dimensions'].items())
+        print(f'\n{size}' + (f' ({dimensions})' if dimensions else ''))
+        for stage, timing in result['stages'].items():
+            print(f"  {stage:<22} median {timing['median_s'] * 1000:>10.2f} ms"
+                  f"   min {timing['min_s'] * 1000:>10.2f} ms   peak {timing['peak_kb']:>10.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the InfraNest generation engine')
+    parser.add_argument('--sizes', default=','.join(SIZES), help='Comma-separated presets: ' + ', '.join(SIZES))
+    parser.add_argument('--models', type=int, help='Override model count for the selected sizes')
+    parser.add_argument('--fields', type=int, help='Override fields per model')
+    parser.add_argument('--relations', type=int, help='Override relations per model')
+    parser.add_argument('--endpoints', type=int, help='Override endpoints per model')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per stage')
+    parser.add_argument('--baseline', default=str(BASELINE_FILE), help='Baseline JSON file')
+    parser.add_argument('--save', action='store_true', help='Write results to the baseline file')
+    parser.add_argument('--check', action='store_true', help='Fail if a stage regressed against the baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed slowdown ratio (0.25 = 25%%)')
+    parser.add_argument('--noise-floor', type=float, default=0.005, help='Ignore stages faster than this (seconds)')
+    parser.add_argument('--output', help='Also write results to this JSON file')
+    args = parser.parse_args()
+
+    sizes = {}
+    for name in args.sizes.split(','):
+        if name not in SIZES:
+            parser.error(f'Unknown size: {name}. Available: {list(SIZES)}')
+        dimensions = dict(SIZES[name])
+        for key in dimensions:
+            if getattr(args, key) is not None:
+                dimensions[key] = getattr(args, key)
+        sizes[name] = dimensions
+
+    report = run(sizes, args.repeat)
+    print_report(report)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+    baseline_path = Path(args.baseline)
+    if args.check:
+        if not baseline_path.exists():
+            print(f'\nNo baseline at {baseline_path}; run with --save first', file=sys.stderr)
+            sys.exit(2)
+        regressions, missing = compare(report, json.loads(baseline_path.read_text()), args.threshold, args.noise_floor)
+        if regressions:
+            print(f'\nRegressions beyond {args.threshold:.0%}:', file=sys.stderr)
+            for size, stage, before, after in regressions:
+                print(f'  {size}/{stage}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms '
+                      f'(+{(after / before - 1):.0%})', file=sys.stderr)
+        if missing:
+            print('\nStages without a baseline entry (run with --save to record them):', file=sys.stderr)
+            for size, stage in missing:
+                print(f'  {size}/{stage}', file=sys.stderr)
+        if regressions or missing:
+            sys.exit(1)
+        print('\nNo regressions against baseline')
+
+    if args.save:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2) + '\n')
+        print(f'\nBaseline saved to {baseline_path}')
+
+
+if __name__ == '__main__':
+    main()
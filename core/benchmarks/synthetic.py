@@ -0,0 +1,109 @@
+"""
+Synthetic DSL Specifications for InfraNest Benchmarks
+Builds valid DSL specs of configurable size
+"""
+
+from typing import Dict, Any
+
+# Scalar field types cycled through when building models
+SCALAR_TYPES = [
+    ('string', {'max_length': 200}),
+    ('text', {}),
+    ('integer', {'default': 0}),
+    ('float', {}),
+    ('boolean', {'default': False}),
+    ('datetime', {'auto_now_add': True}),
+    ('date', {}),
+    ('url', {}),
+    ('email', {'unique': True}),
+    ('json', {}),
+    ('choice', {'choices': ['draft', 'published', 'archived'], 'default': 'draft'}),
+    ('uuid', {})
+]
+
+SIZES = {
+    'small': {'models': 10, 'fields': 8, 'relations': 2, 'endpoints': 5},
+    'medium': {'models': 50, 'fields': 15, 'relations': 3, 'endpoints': 5},
+    'large': {'models': 300, 'fields': 20, 'relations': 4, 'endpoints': 5}
+}
+
+
+def build_spec(models: int, fields: int, relations: int, endpoints: int,
+               framework: str = 'django') -> Dict[str, Any]:
+    """Build a valid DSL spec
+
+    Each model gets ``fields`` scalar fields plus up to ``relations`` foreign
+    keys/many-to-many fields pointing at earlier models (so the graph stays
+    acyclic), and ``endpoints`` API endpoints.
+    """
+    model_names = [f'Model{index:04d}' for index in range(models)]
+    spec_models = {}
+    spec_endpoints = []
+
+    for index, model_name in enumerate(model_names):
+        model_fields = {
+            'id': {'type': 'uuid', 'primary_key': True, 'auto_generated': True}
+        }
+        for field_index in range(fields):
+            field_type, extra = SCALAR_TYPES[field_index % len(SCALAR_TYPES)]
+            model_fields[f'{field_type}_{field_index}'] = {'type': field_type, **extra}
+
+        for relation_index in range(min(relations, index)):
+            target = model_names[(index - relation_index - 1) % models]
+            if relation_index % 2 == 0:
+                model_fields[f'ref_{relation_index}'] = {
+                    'type': 'foreign_key', 'model': target, 'on_delete': 'cascade'
+                }
+            else:
+                model_fields[f'refs_{relation_index}'] = {'type': 'many_to_many', 'model': target}
+
+        spec_models[model_name] = {
+            'fields': model_fields,
+            'permissions': {
+                'read': ['public'],
+                'write': ['owner', 'admin'],
+                'create': ['authenticated'],
+                'delete': ['owner', 'admin']
+            },
+            'search_fields': ['string_0'] if fields else []
+        }
+
+        collection = f'/{model_name.lower()}s'
+        routes = [
+            ('GET', collection, 'list'),
+            ('POST', collection, 'create'),
+            ('GET', f'{collection}/{{id}}', 'retrieve'),
+            ('PUT', f'{collection}/{{id}}', 'update'),
+            ('DELETE', f'{collection}/{{id}}', 'delete')
+        ]
+        for method, path, action in (routes * (endpoints // len(routes) + 1))[:endpoints]:
+            spec_endpoints.append({
+                'path': path,
+                'method': method,
+                'handler': f'{model_name.lower()}s.{action}',
+                'auth_required': method != 'GET'
+            })
+
+    return {
+        'meta': {
+            'name': 'benchmark-project',
+            'version': '1.0.0',
+            'framework': framework,
+            'database': 'postgresql'
+        },
+        'auth': {
+            'provider': 'jwt',
+            'user_model': model_names[0] if model_names else 'User',
+            'required_fields': ['email', 'password']
+        },
+        'models': spec_models,
+        'api': {
+            'base_path': '/api/v1',
+            'endpoints': spec_endpoints
+        },
+        'deployment': {
+            'docker': {'port': 8000, 'health_check': '/health'},
+            'database': {'engine': 'postgresql', 'pool_size': 20},
+            'scaling': {'min_instances': 2, 'max_instances': 10, 'cpu_threshold': 70, 'memory_threshold': 80}
+        }
+    }
@@ -0,0 +1,4 @@
+"""
+Code generators for InfraNest
+Render framework projects and tooling from parsed DSL specifications
+"""
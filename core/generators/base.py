@@ -0,0 +1,289 @@
+"""
+Base Generator for InfraNest
+Shared Jinja2 environment and file helpers for template-driven generators
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader
+
+from parsers.ir import Project
+from .budget import current_budget
+
+
+def _default_templates_dir() -> Path:
+    """Locate the templates directory (mounted at /app/templates in Docker)"""
+    env_dir = os.environ.get('INFRANEST_TEMPLATES_DIR')
+    if env_dir:
+        return Path(env_dir)
+    
+    core_dir = Path(__file__).resolve().parent.parent
+    for candidate in (core_dir / 'templates', core_dir.parent / 'templates'):
+        if candidate.is_dir():
+            return candidate
+    return core_dir / 'templates'
+
+
+FILE_TYPES = {
+    '.py': 'python',
+    '.go': 'go',
+    '.rb': 'ruby',
+    '.json': 'json',
+    '.md': 'markdown',
+    '.txt': 'text',
+    '.ini': 'ini',
+    '.yml': 'yaml',
+    '.yaml': 'yaml',
+    '.html': 'html'
+}
+
+# `{% for ... in models... %}` / `project.models...`: output grows with the model count
+MODEL_LOOP = re.compile(r'\{%-?\s*for\b[^%]*\bin\s+(project\.)?models\b')
+
+
+def file_type(path: str) -> str:
+    """Manifest file type derived from the output path"""
+    name = path.rsplit('/', 1)[-1]
+    if name.startswith('Dockerfile'):
+        return 'dockerfile'
+    return FILE_TYPES.get(os.path.splitext(name)[1], 'text')
+
+
+def json_default(value: Any) -> Any:
+    """``json.dumps`` default encoding the IR's read-only mappings as objects"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+# Code that shapes generated output besides the templates
+_CODE_DIRS = (Path(__file__).resolve().parent, Path(__file__).resolve().parent.parent / 'parsers')
+_code_digests: Dict[type, str] = {}
+_code_lock = threading.Lock()
+
+
+def code_digest(generator_class: type) -> str:
+    """Hash of the generator and parser sources behind ``generator_class``, read once
+
+    Covers the ``generators`` and ``parsers`` packages plus the module of
+    every class in its MRO (plugin generators may live elsewhere), so a code
+    change yields new content hashes. ``INFRANEST_GENERATOR_VERSION`` is
+    mixed in for changes outside those files, such as upgraded dependencies.
+    """
+    digest = _code_digests.get(generator_class)
+    if digest is not None:
+        return digest
+    with _code_lock:
+        files = {path for directory in _CODE_DIRS for path in directory.glob('*.py')}
+        for cls in generator_class.__mro__:
+            module_file = getattr(sys.modules.get(cls.__module__), '__file__', None)
+            if module_file:
+                files.add(Path(module_file).resolve())
+        hasher = hashlib.sha256(os.environ.get('INFRANEST_GENERATOR_VERSION', '').encode())
+        for path in sorted(files):
+            hasher.update(b'\0' + path.name.encode() + b'\0' + path.read_bytes())
+        digest = _code_digests[generator_class] = hasher.hexdigest()
+    return digest
+
+
+def spec_digest(spec: Mapping) -> str:
+    """Hash of a normalized specification"""
+    canonical = json.dumps(spec, separators=(',', ':'), default=_jsonable)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class BaseGenerator:
+    """Base class for generators rendering Jinja2 templates"""
+    
+    template_subdir = ''
+    
+    # Rendered files kept for repeated per-file (e.g. ranged) requests
+    render_cache_size = 64
+    
+    def __init__(self, templates_dir: Optional[Path] = None):
+        self.templates_dir = Path(templates_dir or _default_templates_dir()) / self.template_subdir
+        self.env = Environment(
+            loader=FileSystemLoader(str(self.templates_dir)),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            keep_trailing_newline=True
+        )
+        self.env.policies['json.dumps_kwargs'] = {'sort_keys': True, 'default': json_default}
+        self._template_infos: Dict[str, Tuple[str, int, bool]] = {}
+        self._size_ratios: Dict[str, float] = {}
+        self._render_cache: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def context(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Template context: the spec's sections plus the shared ``project`` IR"""
+        project = Project.coerce(spec)
+        return {**project, 'project': project}
+    
+    def render(self, template_name: str, context: Dict[str, Any]) -> str:
+        """Render a single template with the given context
+        
+        Within a ``RenderBudget`` the output is streamed and charged as it is
+        produced, so an over-budget render is cancelled part-way.
+        """
+        template = self.env.get_template(template_name)
+        budget = current_budget()
+        if budget is None:
+            return template.render(**context)
+        return budget.consume(template.generate(**context))
+    
+    def file_templates(self, spec: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """Map each output path to the template rendering it (None for non-template files)
+        
+        Defaults to every template of ``template_subdir``, named after the template.
+        """
+        return {
+            template_name[:-len('.j2')]: template_name
+            for template_name in self.env.list_templates(extensions=['j2'])
+        }
+    
+    def render_path(self, context: Dict[str, Any], path: str, template_name: Optional[str]) -> str:
+        """Produce the content of one output path; override for non-template files"""
+        return self.render(template_name, context)
+    
+    def generate(self, spec: Dict[str, Any]) -> Dict[str, str]:
+        """Generate files as a mapping of output path to content"""
+        context = self.context(spec)
+        budget = current_budget()
+        files = {}
+        for path, template_name in self.file_templates(context['project']).items():
+            files[path] = self.render_path(context, path, template_name)
+            if budget is not None and template_name is None:
+                # Template output is charged while rendering; other files here
+                budget.charge(files[path])
+        return files
+    
+    def preview(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Describe the generated file structure"""
+        return {'files': self.describe_files(spec)}
+    
+    def describe_files(self, spec: Dict[str, Any]) -> List[Dict[str, str]]:
+        """List generated files with their type and description
+        
+        Defaults to the paths of ``file_templates`` with their type; override
+        to add descriptions.
+        """
+        return [
+            {'path': path, 'type': file_type(path)}
+            for path in self.file_templates(Project.coerce(spec))
+        ]
+    
+    def manifest(self, spec: Dict[str, Any], digest: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List generated files with types, estimated sizes and content hashes
+        
+        Nothing is rendered: the hash covers the generator code, the template
+        source and the specification, so it changes whenever the content can.
+        Sizes are exact for files already rendered with the same hash.
+        ``digest`` is the precomputed ``spec_digest`` of ``spec``, if known.
+        """
+        context = self.context(spec)
+        project = context['project']
+        digest = digest or spec_digest(project)
+        
+        descriptions = {entry['path']: entry.get('description') for entry in self.describe_files(project)}
+        
+        files = []
+        for path, template_name in self.file_templates(project).items():
+            content_hash = self.file_hash(path, template_name, digest)
+            with self._lock:
+                cached = self._render_cache.get(content_hash)
+            
+            entry = {
+                'path': path,
+                'type': file_type(path),
+                'hash': content_hash,
+                'estimated_size': len(cached.encode()) if cached is not None
+                else self.estimate_size(context, path, template_name),
+                'size_exact': cached is not None
+            }
+            if descriptions.get(path):
+                entry['description'] = descriptions[path]
+            files.append(entry)
+        
+        return files
+    
+    def render_file(self, spec: Dict[str, Any], path: str, digest: Optional[str] = None) -> Dict[str, str]:
+        """Render a single output path, returning its ``content`` and ``hash``
+        
+        Raises KeyError when the generator does not produce ``path``.
+        """
+        context = self.context(spec)
+        template_name = self.file_templates(context['project'])[path]
+        content_hash = self.path_hash(context['project'], path, digest)
+        
+        with self._lock:
+            content = self._render_cache.get(content_hash)
+            if content is not None:
+                self._render_cache.move_to_end(content_hash)
+                return {'content': content, 'hash': content_hash}
+        
+        content = self.render_path(context, path, template_name)
+        budget = current_budget()
+        if budget is not None and template_name is None:
+            budget.charge(content)
+        
+        with self._lock:
+            if template_name:
+                # Calibrate later estimates for this template
+                estimate = self._raw_estimate(context, template_name)
+                if estimate:
+                    self._size_ratios[template_name] = len(content.encode()) / estimate
+            self._render_cache[content_hash] = content
+            while len(self._render_cache) > self.render_cache_size:
+                self._render_cache.popitem(last=False)
+        
+        return {'content': content, 'hash': content_hash}
+    
+    def path_hash(self, spec: Dict[str, Any], path: str, digest: Optional[str] = None) -> str:
+        """Content hash of one output path, without rendering it (KeyError if unknown)"""
+        project = Project.coerce(spec)
+        return self.file_hash(path, self.file_templates(project)[path], digest or spec_digest(project))
+    
+    def file_hash(self, path: str, template_name: Optional[str], digest: str) -> str:
+        """Content hash of an output path for a specification digest"""
+        template_digest = self._template_info(template_name)[0] if template_name else ''
+        key = f"{type(self).__qualname__}\0{code_digest(type(self))}\0{path}\0{template_digest}\0{digest}"
+        return hashlib.sha256(key.encode()).hexdigest()
+    
+    def estimate_size(self, context: Dict[str, Any], path: str, template_name: Optional[str]) -> int:
+        """Estimated byte size of an output path, without rendering it"""
+        if not template_name:
+            return 0
+        estimate = self._raw_estimate(context, template_name)
+        return int(estimate * self._size_ratios.get(template_name, 1.0))
+    
+    def _raw_estimate(self, context: Dict[str, Any], template_name: str) -> int:
+        # Template size, scaled by model count for templates looping over models
+        _, size, loops_models = self._template_info(template_name)
+        if loops_models:
+            return size * max(1, len(context['project'].models))
+        return size
+    
+    def _template_info(self, template_name: str) -> Tuple[str, int, bool]:
+        """Source digest, byte size and whether the template loops over models, read once"""
+        info = self._template_infos.get(template_name)
+        if info is None:
+            source = self.env.loader.get_source(self.env, template_name)[0]
+            loops_models = MODEL_LOOP.search(source) is not None
+            info = (hashlib.sha256(source.encode()).hexdigest(), len(source.encode()), loops_models)
+            self._template_infos[template_name] = info
+        return info
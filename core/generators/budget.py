@@ -0,0 +1,101 @@
+"""
+Generation Budgets for InfraNest
+Wall-clock deadline and output size cap, enforced cooperatively while rendering
+"""
+
+import os
+import time
+from contextvars import ContextVar
+from itertools import islice
+from typing import Iterable, Optional
+
+RENDER_DEADLINE = float(os.environ.get('INFRANEST_RENDER_DEADLINE', 30))
+MAX_OUTPUT_BYTES = int(os.environ.get('INFRANEST_MAX_OUTPUT_BYTES', 32 * 1024 * 1024))
+
+# Template output chunks rendered between budget checks
+CHECK_INTERVAL = 64
+
+_current: ContextVar[Optional['RenderBudget']] = ContextVar('render_budget', default=None)
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised when generation exceeds its budget"""
+
+    status_code = 422
+
+
+class RenderDeadlineExceeded(BudgetExceeded):
+    """Raised when generation runs past its wall-clock deadline"""
+
+    status_code = 422
+
+
+class OutputTooLarge(BudgetExceeded):
+    """Raised when generated output exceeds the byte cap"""
+
+    status_code = 413
+
+
+def current_budget() -> Optional['RenderBudget']:
+    """Budget of the generation running in this context, if any"""
+    return _current.get()
+
+
+class RenderBudget:
+    """Deadline and byte cap shared by everything generated for one request
+
+    Used as a context manager; generators pick it up through
+    ``current_budget()`` and charge template output as it is produced, so
+    an over-budget render stops at the next chunk instead of completing.
+    """
+
+    def __init__(self, deadline: float = RENDER_DEADLINE, max_bytes: int = MAX_OUTPUT_BYTES):
+        self.deadline = deadline
+        self.max_bytes = max_bytes
+        self.expires_at = time.monotonic() + deadline
+        self.used = 0
+        self._token = None
+
+    def __enter__(self) -> 'RenderBudget':
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _current.reset(self._token)
+        self._token = None
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def check(self):
+        """Raise once the deadline has passed"""
+        if time.monotonic() > self.expires_at:
+            raise self.deadline_exceeded()
+
+    def deadline_exceeded(self) -> RenderDeadlineExceeded:
+        return RenderDeadlineExceeded(f"Generation exceeded its {self.deadline:g}s deadline")
+
+    def charge(self, content: str):
+        """Account for generated content, raising once the byte cap is exceeded"""
+        self.used += len(content.encode())
+        if self.used > self.max_bytes:
+            raise OutputTooLarge(f"Generated output exceeds the limit of {self.max_bytes} bytes")
+
+    def consume(self, chunks: Iterable[str]) -> str:
+        """Join streamed template output, checking the budget after every batch of chunks"""
+        chunks = iter(chunks)
+        parts = []
+        size = self.used
+        while True:
+            batch = list(islice(chunks, CHECK_INTERVAL))
+            if not batch:
+                break
+            parts.extend(batch)
+            # Characters never outnumber UTF-8 bytes, so this cannot trip early
+            size += sum(map(len, batch))
+            if size > self.max_bytes:
+                raise OutputTooLarge(f"Generated output exceeds the limit of {self.max_bytes} bytes")
+            self.check()
+        content = ''.join(parts)
+        self.charge(content)
+        return content
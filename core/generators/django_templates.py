@@ -0,0 +1,35 @@
+"""
+Django Templates for InfraNest
+Selects the Django templates a specification needs, leaving out files for features it does not enable
+"""
+
+from typing import Dict, Any, Optional
+
+from parsers.ir import Project
+from .base import BaseGenerator
+
+
+class DjangoTemplates(BaseGenerator):
+    """Renders the Django template set
+
+    Files for optional deployment features are emitted only when the derived
+    runtime enables them, rather than rendered empty.
+    """
+
+    template_subdir = 'django'
+
+    # Template -> ``deployment.runtime`` setting that must be set for it to be emitted
+    optional_templates = {
+        'pgbouncer.ini.j2': 'pgbouncer',
+        'db_router.py.j2': 'replicas',
+        'metrics.py.j2': 'metrics'
+    }
+
+    def file_templates(self, spec: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """Every Django template, minus those for features the specification leaves off"""
+        runtime = Project.coerce(spec).get('deployment', {}).get('runtime', {})
+        return {
+            path: template_name
+            for path, template_name in super().file_templates(spec).items()
+            if template_name not in self.optional_templates or runtime.get(self.optional_templates[template_name])
+        }
@@ -0,0 +1,179 @@
+"""
+Code Formatting for InfraNest
+Formats generated Python with isort and black in resident worker processes, cached by content hash
+"""
+
+import atexit
+import hashlib
+import importlib.util
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LINE_LENGTH = 100
+
+# Web server processes (gunicorn's WEB_CONCURRENCY) each run their own pool
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+# Formatter state kept resident in each worker process
+_black = None
+_black_mode = None
+_isort = None
+_isort_config = None
+
+
+def _init_worker(line_length: int):
+    """Import the formatters and build their configuration once per worker"""
+    global _black, _black_mode, _isort, _isort_config
+    import black
+    import isort
+
+    _black = black
+    _black_mode = black.Mode(line_length=line_length)
+    _isort = isort
+    _isort_config = isort.Config(profile='black', line_length=line_length)
+
+
+def default_workers() -> int:
+    """Pool size per web process: half of its share of the cores, leaving room to render"""
+    return max(1, (os.cpu_count() or 1) // (2 * max(1, WEB_CONCURRENCY)))
+
+
+def _mp_context():
+    # Workers start from a clean server process rather than forking a
+    # threaded web worker (held locks, sockets and Redis/DB connections)
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def _format_source(source: str) -> str:
+    """Format one file; generated code that does not parse is returned as-is"""
+    try:
+        sorted_source = _isort.code(source, config=_isort_config)
+        return _black.format_str(sorted_source, mode=_black_mode)
+    except Exception:
+        return source
+
+
+class FormatterPool:
+    """Persistent pool of formatter processes with an LRU cache of results
+
+    The cache key is a hash of the raw rendered content plus the formatter
+    configuration, so a file that renders identically in a later generation
+    is returned without touching the pool.
+    """
+
+    def __init__(self, workers: Optional[int] = None, cache_size: int = 4096, line_length: int = LINE_LENGTH):
+        self.workers = workers or default_workers()
+        self.cache_size = cache_size
+        self.line_length = line_length
+        self.available = all(importlib.util.find_spec(name) for name in ('black', 'isort'))
+        self._cache: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._fingerprint = self._config_fingerprint()
+        self.hits = 0
+        self.misses = 0
+
+        if not self.available:
+            logger.info("black/isort not installed; generated Python is not formatted")
+
+    def _config_fingerprint(self) -> str:
+        if not self.available:
+            return ''
+        from importlib.metadata import version
+        return f"black={version('black')};isort={version('isort')};line_length={self.line_length}"
+
+    def _key(self, source: str) -> str:
+        return hashlib.sha256(f"{self._fingerprint}\0{source}".encode()).hexdigest()
+
+    def formatted_hash(self, path: str, content_hash: str) -> str:
+        """Identify the formatted form of the content identified by ``content_hash``"""
+        if not self.available or not path.endswith('.py'):
+            return content_hash
+        return self._key(content_hash)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=_mp_context(),
+                        initializer=_init_worker,
+                        initargs=(self.line_length,)
+                    )
+        return self._executor
+
+    def warm_up(self):
+        """Start the worker processes ahead of the first request"""
+        if self.available:
+            list(self._get_executor().map(_format_source, ['x = 1\n'] * self.workers))
+
+    def format_files(self, files: Dict[str, str], timeout: Optional[float] = None) -> Dict[str, str]:
+        """Return ``files`` with every ``.py`` file formatted
+
+        Raises ``concurrent.futures.TimeoutError`` if formatting takes longer
+        than ``timeout`` seconds.
+        """
+        if not self.available:
+            return files
+
+        formatted = dict(files)
+        pending: Dict[str, List[str]] = {}
+        with self._lock:
+            for path, source in files.items():
+                if not path.endswith('.py'):
+                    continue
+                key = self._key(source)
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    formatted[path] = cached
+                    self.hits += 1
+                else:
+                    # Identical sources within one request are formatted once
+                    pending.setdefault(key, []).append(path)
+                    self.misses += 1
+
+        if not pending:
+            return formatted
+
+        keys = list(pending)
+        sources = [files[pending[key][0]] for key in keys]
+        chunksize = max(1, len(sources) // (self.workers * 4))
+        results = list(self._get_executor().map(_format_source, sources, timeout=timeout, chunksize=chunksize))
+
+        with self._lock:
+            for key, result in zip(keys, results):
+                for path in pending[key]:
+                    formatted[path] = result
+                self._cache[key] = result
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return formatted
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+formatter_pool = FormatterPool(
+    workers=int(os.environ.get('INFRANEST_FORMAT_WORKERS', 0)) or None,
+    cache_size=int(os.environ.get('INFRANEST_FORMAT_CACHE_SIZE', 4096))
+)
+atexit.register(formatter_pool.shutdown)
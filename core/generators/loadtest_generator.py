@@ -0,0 +1,188 @@
+"""
+Load-Test Generator for InfraNest
+Builds a self-contained asyncio load-test harness from the DSL's models, auth and API endpoints
+"""
+
+import json
+import re
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+
+from parsers.ir import Project
+from .base import BaseGenerator, json_default
+
+
+class LoadTestGenerator(BaseGenerator):
+    """Generator for capacity-testing harnesses"""
+
+    template_subdir = 'loadtest'
+
+    def context(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Template context including the scenario shared by the script and scenario.json"""
+        context = super().context(spec)
+        context['scenario'] = self.build_scenario(context['project'])
+        return context
+
+    def file_templates(self, spec: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """The harness script, its scenario and a README"""
+        return {
+            'loadtest/loadtest.py': 'loadtest.py.j2',
+            'loadtest/scenario.json': None,
+            'loadtest/README.md': 'README.md.j2'
+        }
+
+    def render_path(self, context: Dict[str, Any], path: str, template_name: Optional[str]) -> str:
+        if template_name is None:
+            return json.dumps(context['scenario'], indent=2, default=json_default) + '\n'
+        return super().render_path(context, path, template_name)
+
+    def estimate_size(self, context: Dict[str, Any], path: str, template_name: Optional[str]) -> int:
+        if template_name is None:
+            # Compact size of the scenario; indentation is left to the real render
+            return len(json.dumps(context['scenario'], separators=(',', ':'), default=json_default))
+        return super().estimate_size(context, path, template_name)
+
+    def describe_files(self, spec: Dict[str, Any]) -> List[Dict[str, str]]:
+        """List generated load-test files"""
+        return [
+            {'path': 'loadtest/loadtest.py', 'type': 'python', 'description': 'Asyncio load-test harness'},
+            {'path': 'loadtest/scenario.json', 'type': 'json', 'description': 'Seed data plan and request mix'},
+            {'path': 'loadtest/README.md', 'type': 'markdown', 'description': 'Load-test usage'}
+        ]
+
+    def build_scenario(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the seed plan and weighted request mix from the specification"""
+        project = Project.coerce(spec)
+        models = project.models
+        api = project.get('api', {})
+        settings = project.get('loadtest', {})
+        port = project.get('deployment', {}).get('docker', {}).get('port', 8000)
+
+        return {
+            'project': project.name,
+            'base_url': settings.get('base_url', f'http://localhost:{port}'),
+            'base_path': api.get('base_path', '/api/v1').rstrip('/'),
+            'auth': self._build_auth(project),
+            'seed': {
+                'count': settings.get('seed_count', 20),
+                'models': self._build_seed_models(project)
+            },
+            'requests': self._build_requests(project, settings),
+            'users': settings.get('users', 10),
+            'duration': settings.get('duration', 30)
+        }
+
+    def _build_auth(self, project: Project) -> Optional[Dict[str, Any]]:
+        """Describe how virtual users obtain credentials"""
+        auth = project.get('auth')
+        if not auth:
+            return None
+
+        handlers = {endpoint.handler: endpoint.path for endpoint in project.endpoints}
+
+        return {
+            'provider': auth.get('provider'),
+            'register_path': handlers.get('auth.register'),
+            'login_path': handlers.get('auth.login'),
+            'fields': auth.get('required_fields', ['email', 'password'])
+        }
+
+    def _build_seed_models(self, project: Project) -> List[Dict[str, Any]]:
+        """List models in foreign-key dependency order with payload field plans"""
+        seed_models = []
+
+        for model_name in project.relations.topological_order:
+            model = project.models[model_name]
+            fields = {}
+            for model_field in model.fields:
+                if model_field.primary_key or model_field.read_only:
+                    continue
+                if model_field.type == 'foreign_key' and model_field.target == model_name:
+                    # Self references are left empty while seeding
+                    continue
+                fields[model_field.name] = self._field_plan(model_field.options)
+
+            seed_models.append({
+                'model': model_name,
+                'collection': model.plural,
+                'primary_key': model.pk_name,
+                'is_user_model': model is project.user_model,
+                'fields': fields
+            })
+
+        return seed_models
+
+    def _field_plan(self, field_def: Mapping) -> Dict[str, Any]:
+        """Describe how the harness should fabricate a value for a field"""
+        plan = {'type': field_def.get('type')}
+        for key in ('max_length', 'unique', 'choices', 'model', 'required', 'null'):
+            if key in field_def:
+                plan[key] = field_def[key]
+        return plan
+
+    def _build_requests(self, project: Project, settings: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Turn API endpoints into a weighted read/write request mix"""
+        collections = {model.plural: name for name, model in project.models.items()}
+        read_ratio = settings.get('read_ratio', 0.8)
+
+        requests = []
+        for endpoint in project.endpoints:
+            if endpoint.handler.startswith('auth.'):
+                continue
+
+            model_name, detail, filters = self._bind_path(endpoint.path, collections, project)
+            if model_name is None:
+                continue
+
+            requests.append({
+                'name': f"{endpoint.method} {endpoint.path}",
+                'method': endpoint.method,
+                'model': model_name,
+                'detail': detail,
+                'filters': filters,
+                'auth': endpoint.auth_required,
+                'weight': endpoint.get('weight')
+            })
+
+        # Split the read/write ratio evenly across endpoints without explicit weights
+        reads = [r for r in requests if r['method'] == 'GET' and r['weight'] is None]
+        writes = [r for r in requests if r['method'] != 'GET' and r['weight'] is None]
+        for group, share in ((reads, read_ratio), (writes, 1 - read_ratio)):
+            for request in group:
+                request['weight'] = round(share / len(group), 4)
+
+        return requests
+
+    def _bind_path(self, path: str, collections: Dict[str, str],
+                   project: Project) -> Tuple[Optional[str], bool, Dict[str, str]]:
+        """Map a DSL endpoint onto the generated router's list/detail routes
+
+        Returns the target model, whether the route addresses a single object,
+        and parent parameters turned into foreign key filters on the list route.
+        """
+        segments = [segment for segment in path.strip('/').split('/') if segment]
+        target = None
+        detail = False
+        parents = []
+
+        for segment in segments:
+            match = re.fullmatch(r'\{(\w+)\}', segment)
+            if match:
+                detail = True
+                parents.append((target, match.group(1)))
+            elif segment in collections:
+                target = collections[segment]
+                detail = False
+
+        if target is None:
+            return None, False, {}
+
+        filters = {}
+        for owner, param in (parents[:-1] if detail else parents):
+            owner_name = param.rpartition('_')[0]
+            owner = next((m for m in project.models if m.lower() == owner_name), owner)
+            for relation in project.relations.relations_to(owner):
+                if relation.source == target and relation.type == 'foreign_key':
+                    filters[relation.field] = owner
+                    break
+
+        return target, detail, filters
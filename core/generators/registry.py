@@ -0,0 +1,140 @@
+"""
+Generator Registry for InfraNest
+Discovers framework generators from the manifest and entry points and imports them on first use
+"""
+
+import importlib
+import importlib.util
+import json
+import logging
+import threading
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = Path(__file__).resolve().parent / 'manifest.json'
+ENTRY_POINT_GROUP = 'infranest.generators'
+
+
+class GeneratorUnavailable(LookupError):
+    """Raised when a framework's generator cannot be loaded"""
+
+    status_code = 503
+
+
+class UnknownFramework(GeneratorUnavailable):
+    """Raised when no generator is registered for a framework"""
+
+    status_code = 400
+
+
+class GeneratorRegistry:
+    """Lazy registry of framework generators
+
+    Discovery only reads metadata: the bundled manifest, plus any installed
+    plugin exposing an ``infranest.generators`` entry point that resolves to a
+    manifest entry (a dict, or a list of dicts, with the same keys). The
+    ``entry`` module is imported and instantiated the first time a framework
+    is requested; ``available`` tells whether it can be, without importing it.
+    """
+
+    metadata_keys = ('id', 'name', 'description', 'language', 'features')
+
+    def __init__(self, manifest_file: Path = MANIFEST_FILE, entry_point_group: Optional[str] = ENTRY_POINT_GROUP):
+        self.manifest_file = manifest_file
+        self.entry_point_group = entry_point_group
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Manifest entries keyed by framework id, discovered once"""
+        if self._entries is None:
+            with self._lock:
+                if self._entries is None:
+                    self._entries = self._discover()
+        return self._entries
+
+    def _discover(self) -> Dict[str, Dict[str, Any]]:
+        entries = {}
+        with open(self.manifest_file) as f:
+            for entry in json.load(f)['generators']:
+                entries[entry['id']] = entry
+
+        if self.entry_point_group:
+            for entry_point in entry_points(group=self.entry_point_group):
+                try:
+                    plugin = entry_point.load()
+                except Exception as e:
+                    logger.error(f"Error loading generator plugin {entry_point.name}: {str(e)}")
+                    continue
+                for entry in (plugin if isinstance(plugin, list) else [plugin]):
+                    entries[entry['id']] = entry
+
+        return entries
+
+    def __contains__(self, framework: str) -> bool:
+        return framework in self.entries
+
+    def ids(self) -> List[str]:
+        return list(self.entries)
+
+    def available(self, framework: str) -> bool:
+        """Whether the generator for ``framework`` is loaded or its module can be found"""
+        if framework in self._instances:
+            return True
+        entry = self.entries.get(framework)
+        if entry is None:
+            return False
+        try:
+            return importlib.util.find_spec(entry['entry'].partition(':')[0]) is not None
+        except ImportError:
+            return False
+
+    def metadata(self) -> List[Dict[str, Any]]:
+        """Public framework descriptions, without importing any generator"""
+        return [
+            {
+                **{key: entry[key] for key in self.metadata_keys if key in entry},
+                'available': self.available(framework)
+            }
+            for framework, entry in self.entries.items()
+        ]
+
+    def get(self, framework: str) -> Any:
+        """Return the generator for ``framework``, importing it on first use"""
+        generator = self._instances.get(framework)
+        if generator is not None:
+            return generator
+
+        entry = self.entries.get(framework)
+        if entry is None:
+            raise UnknownFramework(f"Unsupported framework: {framework}")
+
+        with self._lock:
+            if framework not in self._instances:
+                module_name, _, class_name = entry['entry'].partition(':')
+                try:
+                    generator_class = getattr(importlib.import_module(module_name), class_name)
+                except (ImportError, AttributeError) as e:
+                    raise GeneratorUnavailable(f"Generator for {framework} could not be loaded: {e}") from e
+                self._instances[framework] = generator_class()
+                logger.info(f"Loaded {framework} generator")
+        return self._instances[framework]
+
+    def loaded(self) -> List[str]:
+        return list(self._instances)
+
+    def warm_up(self, frameworks: Optional[Iterable[str]] = None):
+        """Import generators ahead of the first request (all when ``frameworks`` is None)"""
+        for framework in (self.ids() if frameworks is None else frameworks):
+            try:
+                self.get(framework)
+            except GeneratorUnavailable as e:
+                logger.error(f"Error warming up {framework} generator: {str(e)}")
+
+
+registry = GeneratorRegistry()
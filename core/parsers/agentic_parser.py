@@ -9,6 +9,8 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 import yaml
 
+from .ir import pluralize
+
 class AgenticParser:
     """AI-powered parser for converting natural language to DSL"""
     
@@ -177,8 +179,7 @@ class AgenticParser:
         
         # Generate CRUD endpoints for each model
         for model_name in models.keys():
-            model_lower = model_name.lower()
-            model_plural = f"{model_lower}s"  # Simple pluralization
+            model_plural = pluralize(model_name)
             
             endpoints.extend([
                 {'path': f'/{model_plural}', 'method': 'GET', 'handler': f'{model_plural}.list', 'public': True},
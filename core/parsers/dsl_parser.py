@@ -5,14 +5,65 @@ Validates and parses DSL specifications into structured data
 
 import yaml
 import json
-from typing import Dict, List, Any, Optional
+import os
+from typing import Dict, List, Any, Iterable, Optional
 from datetime import datetime
 import re
 
+from infranest_dsl import DSLLoadError, DSLTooLargeError
+
+from .ir import BULK_OPERATIONS, MAX_BULK_BATCH_SIZE, Project, pluralize
+from .relations import RelationGraph
+
+# Resource budgets for a single specification, checked before any other work
+DEFAULT_LIMITS = {
+    'models': int(os.environ.get('INFRANEST_DSL_MAX_MODELS', 500)),
+    'fields': int(os.environ.get('INFRANEST_DSL_MAX_FIELDS', 200)),
+    'endpoints': int(os.environ.get('INFRANEST_DSL_MAX_ENDPOINTS', 2500)),
+    'choices': int(os.environ.get('INFRANEST_DSL_MAX_CHOICES', 500)),
+    'default_depth': int(os.environ.get('INFRANEST_DSL_MAX_DEFAULT_DEPTH', 8))
+}
+
+
+# Application servers the Django templates can run
+WSGI_SERVERS = ('gunicorn', 'uvicorn', 'uwsgi')
+
+
+class DSLValidationError(DSLLoadError):
+    """Raised when a DSL specification fails validation"""
+    
+    status_code = 422
+
+
+class DSLBudgetError(DSLTooLargeError):
+    """Raised when a DSL specification exceeds a resource budget"""
+
+
+def _exceeds_depth(value: Any, max_depth: int) -> bool:
+    """Whether nested lists/mappings in ``value`` go deeper than ``max_depth``"""
+    stack = [(value, 0)]
+    while stack:
+        value, depth = stack.pop()
+        if isinstance(value, dict):
+            value = value.values()
+        elif not isinstance(value, list):
+            continue
+        if depth == max_depth:
+            return True
+        stack.extend((item, depth + 1) for item in value)
+    return False
+
+
 class DSLParser:
-    """Parser for InfraNest DSL specifications"""
+    """Parser for InfraNest DSL specifications
+    
+    ``frameworks`` lists the framework ids ``meta.framework`` may name (the
+    generator registry's ids); when omitted the framework is not checked.
+    """
     
-    def __init__(self):
+    def __init__(self, limits: Optional[Dict[str, int]] = None, frameworks: Optional[Iterable[str]] = None):
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.frameworks = list(frameworks) if frameworks is not None else None
         self.required_sections = ['meta', 'models']
         self.optional_sections = ['auth', 'api', 'jobs', 'deployment']
         self.field_types = [
@@ -23,21 +74,45 @@ class DSLParser:
         
     def parse(self, dsl_spec: Dict[str, Any]) -> Dict[str, Any]:
         """Parse and validate DSL specification"""
+        normalized_spec, _ = self._parse(dsl_spec)
+        return normalized_spec
+    
+    def parse_project(self, dsl_spec: Dict[str, Any]) -> Project:
+        """Parse a DSL specification into the immutable IR shared by generators"""
+        normalized_spec, relations = self._parse(dsl_spec)
+        return Project.from_spec(normalized_spec, relations)
+    
+    def _parse(self, dsl_spec: Dict[str, Any]) -> tuple[Dict[str, Any], RelationGraph]:
+        """Validate and normalize, returning the relation graph built during validation"""
+        budget_errors = self._check_budgets(dsl_spec)
+        if budget_errors:
+            raise DSLBudgetError(f"DSL specification exceeds its budget: {budget_errors}")
+        
         validation_result = self.validate(dsl_spec)
         
         if not validation_result['valid']:
-            raise ValueError(f"Invalid DSL specification: {validation_result['errors']}")
+            raise DSLValidationError(f"Invalid DSL specification: {validation_result['errors']}")
         
         # Normalize and enrich the specification
         normalized_spec = self._normalize_spec(dsl_spec)
         
-        return normalized_spec
+        return normalized_spec, validation_result['relations']
     
     def validate(self, dsl_spec: Dict[str, Any]) -> Dict[str, Any]:
         """Validate DSL specification"""
         errors = []
         warnings = []
         
+        # Over-budget specifications are rejected without further work
+        budget_errors = self._check_budgets(dsl_spec)
+        if budget_errors:
+            return {
+                'valid': False,
+                'errors': budget_errors,
+                'warnings': warnings,
+                'relations': RelationGraph.from_models({})
+            }
+        
         # Check required sections
         for section in self.required_sections:
             if section not in dsl_spec:
@@ -54,6 +129,12 @@ class DSLParser:
             errors.extend(model_errors)
             warnings.extend(model_warnings)
         
+        # Index relations once; generators reuse the graph through the IR
+        relations = RelationGraph.from_models(dsl_spec.get('models') or {})
+        relation_errors, relation_warnings = self._validate_relations(relations)
+        errors.extend(relation_errors)
+        warnings.extend(relation_warnings)
+        
         # Validate auth section
         if 'auth' in dsl_spec:
             auth_errors = self._validate_auth(dsl_spec['auth'])
@@ -64,12 +145,54 @@ class DSLParser:
             api_errors = self._validate_api(dsl_spec['api'])
             errors.extend(api_errors)
         
+        # Validate deployment section
+        if dsl_spec.get('deployment'):
+            deployment_errors = self._validate_deployment(dsl_spec['deployment'])
+            errors.extend(deployment_errors)
+        
         return {
             'valid': len(errors) == 0,
             'errors': errors,
-            'warnings': warnings
+            'warnings': warnings,
+            'relations': relations
         }
     
+    def _check_budgets(self, dsl_spec: Dict[str, Any]) -> List[str]:
+        """Check model, field, endpoint, choice and default-nesting budgets"""
+        errors = []
+        limits = self.limits
+        
+        models = dsl_spec.get('models')
+        if isinstance(models, dict):
+            if len(models) > limits['models']:
+                errors.append(f"Specification defines {len(models)} models; the limit is {limits['models']}")
+                return errors
+            
+            for model_name, model_def in models.items():
+                fields = model_def.get('fields') if isinstance(model_def, dict) else None
+                if not isinstance(fields, dict):
+                    continue
+                if len(fields) > limits['fields']:
+                    errors.append(f"Model '{model_name}' defines {len(fields)} fields; the limit is {limits['fields']}")
+                    continue
+                
+                for field_name, field_def in fields.items():
+                    if not isinstance(field_def, dict):
+                        continue
+                    choices = field_def.get('choices')
+                    if isinstance(choices, (list, dict)) and len(choices) > limits['choices']:
+                        errors.append(f"Field '{field_name}' in model '{model_name}' has {len(choices)} choices; the limit is {limits['choices']}")
+                    default = field_def.get('default')
+                    if isinstance(default, (list, dict)) and _exceeds_depth(default, limits['default_depth']):
+                        errors.append(f"Default of field '{field_name}' in model '{model_name}' is nested deeper than {limits['default_depth']} levels")
+        
+        api = dsl_spec.get('api')
+        endpoints = api.get('endpoints') if isinstance(api, dict) else None
+        if isinstance(endpoints, list) and len(endpoints) > limits['endpoints']:
+            errors.append(f"API defines {len(endpoints)} endpoints; the limit is {limits['endpoints']}")
+        
+        return errors
+    
     def _validate_meta(self, meta: Dict[str, Any]) -> List[str]:
         """Validate meta section"""
         errors = []
@@ -80,10 +203,9 @@ class DSLParser:
                 errors.append(f"Missing required field in meta: {field}")
         
         # Validate framework
-        if 'framework' in meta:
-            supported_frameworks = ['django', 'go-fiber', 'rails']
-            if meta['framework'] not in supported_frameworks:
-                errors.append(f"Unsupported framework: {meta['framework']}. Supported: {supported_frameworks}")
+        if 'framework' in meta and self.frameworks is not None:
+            if meta['framework'] not in self.frameworks:
+                errors.append(f"Unsupported framework: {meta['framework']}. Supported: {self.frameworks}")
         
         # Validate name format
         if 'name' in meta:
@@ -126,6 +248,94 @@ class DSLParser:
                 warnings.append(f"Model '{model_name}' has no primary key. An 'id' field will be auto-generated.")
             elif primary_key_count > 1:
                 errors.append(f"Model '{model_name}' has multiple primary keys")
+            
+            # Validate list view fields (the auto-generated 'id' counts when no primary key is declared)
+            known_fields = set(model_def['fields']) | ({'id'} if primary_key_count == 0 else set())
+            errors.extend(self._validate_list_fields(model_name, model_def.get('list_fields'), known_fields))
+            
+            # Validate bulk endpoints
+            errors.extend(self._validate_bulk(model_name, model_def.get('bulk')))
+        
+        errors.extend(self._validate_plurals(models))
+        
+        return errors, warnings
+    
+    def _validate_plurals(self, models: Dict[str, Any]) -> List[str]:
+        """Validate URL collection names: optional ``plural`` overrides, unique across models"""
+        errors = []
+        collections = {}
+        
+        for model_name, model_def in models.items():
+            plural = model_def.get('plural')
+            if plural is None:
+                plural = pluralize(model_name)
+            elif not isinstance(plural, str) or not re.match(r'^[a-z0-9][a-z0-9_-]*$', plural):
+                errors.append(f"Model '{model_name}' plural must contain only lowercase letters, numbers, hyphens and underscores")
+                continue
+            
+            if plural in collections:
+                errors.append(f"Models '{collections[plural]}' and '{model_name}' share the URL collection '{plural}'")
+            collections.setdefault(plural, model_name)
+        
+        return errors
+    
+    def _validate_list_fields(self, model_name: str, list_fields: Any, known_fields: set) -> List[str]:
+        """Validate the fields a model serializes in list views"""
+        errors = []
+        
+        if list_fields is None:
+            return errors
+        if not isinstance(list_fields, list) or not list_fields:
+            errors.append(f"Model '{model_name}' list_fields must be a non-empty list of field names")
+            return errors
+        
+        for field_name in list_fields:
+            if field_name not in known_fields:
+                errors.append(f"list_fields of model '{model_name}' references unknown field '{field_name}'")
+        
+        return errors
+    
+    def _validate_bulk(self, model_name: str, bulk: Any) -> List[str]:
+        """Validate a model's bulk option: true, or max_batch_size and operations"""
+        errors = []
+        
+        if bulk is None or isinstance(bulk, bool):
+            return errors
+        if not isinstance(bulk, dict):
+            errors.append(f"Model '{model_name}' bulk option must be true or a mapping")
+            return errors
+        
+        max_batch_size = bulk.get('max_batch_size')
+        if max_batch_size is not None and (
+                isinstance(max_batch_size, bool) or not isinstance(max_batch_size, int)
+                or not 1 <= max_batch_size <= MAX_BULK_BATCH_SIZE):
+            errors.append(f"Model '{model_name}' bulk max_batch_size must be an integer between 1 and {MAX_BULK_BATCH_SIZE}")
+        
+        operations = bulk.get('operations')
+        if operations is not None:
+            if not isinstance(operations, list) or not operations:
+                errors.append(f"Model '{model_name}' bulk operations must be a non-empty list")
+            else:
+                for operation in operations:
+                    if operation not in BULK_OPERATIONS:
+                        errors.append(f"Invalid bulk operation '{operation}' for model '{model_name}'. Supported: {list(BULK_OPERATIONS)}")
+        
+        return errors
+    
+    def _validate_relations(self, relations: RelationGraph) -> tuple[List[str], List[str]]:
+        """Validate relation targets and dependency cycles"""
+        errors = []
+        warnings = []
+        
+        for relation in relations.dangling:
+            if relation.target is None:
+                errors.append(f"Relation field '{relation.field}' in model '{relation.source}' must specify a 'model'")
+            else:
+                errors.append(f"Field '{relation.field}' in model '{relation.source}' references unknown model '{relation.target}'")
+        
+        for cycle in relations.cycles:
+            path = ' -> '.join(cycle + (cycle[0],))
+            warnings.append(f"Required foreign keys form a cycle ({path}). Set 'null: true' on one of them so rows can be created.")
         
         return errors, warnings
     
@@ -157,8 +367,73 @@ class DSLParser:
         
         return errors
     
+    def _validate_deployment(self, deployment: Dict[str, Any]) -> List[str]:
+        """Validate deployment section (runtime sizing and database replicas)"""
+        errors = []
+        
+        sections = {}
+        for section in ('docker', 'database', 'scaling'):
+            value = deployment.get(section) or {}
+            if not isinstance(value, dict):
+                errors.append(f"Deployment {section} must be a mapping")
+                value = {}
+            sections[section] = value
+        database = sections['database']
+        
+        # Values the production runtime is derived from
+        sizing = {
+            'docker': ('cpus', 'memory_mb', 'worker_memory_mb', 'timeout', 'port'),
+            'database': ('pool_size',),
+            'scaling': ('cpu_threshold', 'memory_threshold', 'min_instances', 'max_instances')
+        }
+        for section, keys in sizing.items():
+            for key in keys:
+                value = sections[section].get(key)
+                if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 1):
+                    errors.append(f"Deployment {section}.{key} must be a positive integer")
+        
+        conn_max_age = database.get('conn_max_age')
+        if conn_max_age is not None and (isinstance(conn_max_age, bool) or not isinstance(conn_max_age, int) or conn_max_age < 0):
+            errors.append("Deployment database.conn_max_age must be a non-negative integer")
+        
+        server = deployment.get('wsgi_server', 'gunicorn')
+        if server not in WSGI_SERVERS:
+            errors.append(f"Unsupported wsgi_server: {server}. Supported: {list(WSGI_SERVERS)}")
+        
+        replicas = database.get('replicas')
+        if isinstance(replicas, bool) or not isinstance(replicas, (int, list, type(None))):
+            errors.append("Database replicas must be a count or a list of replicas")
+        elif isinstance(replicas, int):
+            if replicas < 0:
+                errors.append("Database replica count cannot be negative")
+        elif isinstance(replicas, list):
+            names = []
+            for index, replica in enumerate(replicas):
+                if not isinstance(replica, dict):
+                    errors.append(f"Database replica {index + 1} must be a mapping")
+                    continue
+                name = replica.get('name', f'replica_{index + 1}')
+                if not isinstance(name, str) or not re.match(r'^[a-z][a-z0-9_]*$', name) or name == 'default':
+                    errors.append(f"Database replica name '{name}' must be a lowercase identifier other than 'default'")
+                elif name in names:
+                    errors.append(f"Duplicate database replica name '{name}'")
+                names.append(name)
+                weight = replica.get('weight', 1)
+                if isinstance(weight, bool) or not isinstance(weight, int) or weight < 1:
+                    errors.append(f"Database replica '{name}' weight must be a positive integer")
+        
+        read_your_writes = database.get('read_your_writes', 0)
+        if isinstance(read_your_writes, bool) or not isinstance(read_your_writes, (int, float)) or read_your_writes < 0:
+            errors.append("Database read_your_writes must be a non-negative number of seconds")
+        
+        return errors
+    
     def _normalize_spec(self, dsl_spec: Dict[str, Any]) -> Dict[str, Any]:
-        """Normalize and enrich DSL specification"""
+        """Normalize and enrich DSL specification
+        
+        Never mutates the caller's spec: enriched sections are rebuilt, the
+        rest is shared read-only.
+        """
         normalized = dsl_spec.copy()
         
         # Add default values
@@ -166,20 +441,112 @@ class DSLParser:
             normalized['meta'] = {}
         
         # Ensure all models have primary keys
+        models = {}
         for model_name, model_def in normalized.get('models', {}).items():
-            if 'fields' in model_def:
-                has_primary_key = any(
-                    field.get('primary_key', False) 
-                    for field in model_def['fields'].values()
-                )
-                
-                if not has_primary_key:
-                    # Add auto-generated ID field
-                    if 'id' not in model_def['fields']:
-                        model_def['fields']['id'] = {
+            fields = model_def.get('fields')
+            if fields is not None and 'id' not in fields and not any(
+                field.get('primary_key', False) for field in fields.values()
+            ):
+                # Add auto-generated ID field
+                model_def = {
+                    **model_def,
+                    'fields': {
+                        **fields,
+                        'id': {
                             'type': 'uuid',
                             'primary_key': True,
                             'auto_generated': True
                         }
+                    }
+                }
+            models[model_name] = model_def
+        if 'models' in normalized:
+            normalized['models'] = models
         
-        return normalized
\ No newline at end of file
+        # Derive production runtime tuning from deployment settings
+        deployment = normalized.get('deployment') or {}
+        normalized['deployment'] = {
+            **deployment,
+            'runtime': self._derive_runtime(normalized['meta'], deployment)
+        }
+        
+        return normalized
+    
+    def _derive_runtime(self, meta: Dict[str, Any], deployment: Dict[str, Any]) -> Dict[str, Any]:
+        """Derive app server, connection and pooling settings from deployment config"""
+        docker = deployment.get('docker') or {}
+        database = deployment.get('database') or {}
+        scaling = deployment.get('scaling') or {}
+        monitoring = deployment.get('monitoring') or {}
+        cache = deployment.get('cache') or {}
+        
+        cpus = max(1, int(docker.get('cpus', 1)))
+        memory_mb = int(docker.get('memory_mb', 512))
+        worker_memory_mb = int(docker.get('worker_memory_mb', 128))
+        cpu_threshold = scaling.get('cpu_threshold', 70)
+        memory_threshold = scaling.get('memory_threshold', 80)
+        
+        # (2 x cores) + 1, scaled so an instance reaches the autoscaling CPU
+        # threshold before it saturates, and capped by the memory budget
+        cpu_workers = round((2 * cpus + 1) * cpu_threshold / 100)
+        memory_workers = (memory_mb * memory_threshold // 100) // worker_memory_mb
+        workers = max(1, min(cpu_workers, memory_workers))
+        
+        # Every worker thread may hold one connection from the instance pool
+        pool_size = int(database.get('pool_size', 10))
+        server = deployment.get('wsgi_server', 'gunicorn')
+        if server == 'uvicorn':
+            worker_class = 'uvicorn.workers.UvicornWorker'
+            threads = 1
+        else:
+            threads = max(1, min(8, pool_size // workers))
+            worker_class = 'gthread' if threads > 1 else 'sync'
+        
+        engine = database.get('engine', meta.get('database', 'postgresql'))
+        pgbouncer = database.get('pgbouncer')
+        if pgbouncer and engine == 'postgresql':
+            pgbouncer = pgbouncer if isinstance(pgbouncer, dict) else {}
+            pgbouncer = {
+                'pool_mode': pgbouncer.get('pool_mode', 'transaction'),
+                'port': pgbouncer.get('port', 6432),
+                'default_pool_size': pool_size,
+                'max_client_conn': pgbouncer.get('max_client_conn', workers * threads * 4),
+                'server_idle_timeout': pgbouncer.get('server_idle_timeout', 600)
+            }
+        else:
+            pgbouncer = None
+        
+        # Read replicas: explicit list, or a count of identically weighted ones
+        replicas = database.get('replicas') or []
+        if isinstance(replicas, int):
+            replicas = [{} for _ in range(replicas)]
+        replicas = [
+            {
+                'alias': replica.get('name', f'replica_{index + 1}'),
+                'env': f"DB_{replica.get('name', f'replica_{index + 1}').upper()}",
+                'weight': replica.get('weight', 1)
+            }
+            for index, replica in enumerate(replicas)
+        ]
+        
+        return {
+            'server': server,
+            'worker_class': worker_class,
+            'workers': workers,
+            'threads': threads,
+            'timeout': docker.get('timeout', 30),
+            'keepalive': 5,
+            'max_requests': 1000,
+            'max_requests_jitter': 100,
+            'port': docker.get('port', 8000),
+            'engine': engine,
+            'pool_size': pool_size,
+            'conn_max_age': database.get('conn_max_age', 600),
+            'pgbouncer': pgbouncer,
+            'replicas': replicas,
+            'read_your_writes': database.get('read_your_writes', 5),
+            'cache': cache.get('engine') if isinstance(cache, dict) else cache,
+            'metrics': bool(monitoring.get('metrics') if isinstance(monitoring, dict) else monitoring),
+            'min_instances': scaling.get('min_instances', 1),
+            'max_instances': scaling.get('max_instances', 1)
+        }
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""
+Intermediate Representation for InfraNest
+Immutable, slotted view of a normalized DSL specification shared by all generators
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+from .relations import RELATION_TYPES, RelationGraph
+
+READ_ONLY_FLAGS = ('auto_generated', 'auto_now_add', 'auto_now')
+
+BULK_OPERATIONS = ('create', 'update', 'delete')
+DEFAULT_BULK_BATCH_SIZE = 1000
+MAX_BULK_BATCH_SIZE = 10000
+
+_EMPTY = MappingProxyType({})
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def freeze(value: Any) -> Any:
+    """Read-only deep copy of a specification value: mappings become proxies, lists tuples
+
+    The IR never shares containers with the caller's specification, so
+    mutating the spec after parsing cannot change the IR.
+    """
+    if isinstance(value, _SCALARS):
+        return value
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def pluralize(model_name: str) -> str:
+    """URL collection name for a model, as registered by the generated routers"""
+    return f"{model_name.lower()}s"
+
+
+def bulk_options(value: Any) -> Optional[Mapping]:
+    """Normalized ``bulk`` model option (``true`` or a mapping), or None when disabled"""
+    if not value:
+        return None
+    options = value if isinstance(value, Mapping) else {}
+    return MappingProxyType({
+        'max_batch_size': options.get('max_batch_size', DEFAULT_BULK_BATCH_SIZE),
+        'operations': tuple(options.get('operations', BULK_OPERATIONS))
+    })
+
+
+@dataclass(frozen=True, slots=True)
+class Field:
+    """A model field; derived flags are computed once at construction"""
+
+    name: str
+    type: str
+    options: Mapping = field(default_factory=lambda: _EMPTY)
+    primary_key: bool = field(init=False)
+    read_only: bool = field(init=False)
+    target: Optional[str] = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'primary_key', bool(self.options.get('primary_key')))
+        object.__setattr__(self, 'read_only', any(self.options.get(flag) for flag in READ_ONLY_FLAGS))
+        object.__setattr__(self, 'target', self.options.get('model') if self.is_relation else None)
+
+    @property
+    def is_relation(self) -> bool:
+        return self.type in RELATION_TYPES
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Read a raw field option"""
+        return self.options.get(key, default)
+
+    @classmethod
+    def from_spec(cls, name: str, field_def: Dict[str, Any]) -> 'Field':
+        return cls._from_frozen(name, freeze(field_def))
+
+    @classmethod
+    def _from_frozen(cls, name: str, field_def: Mapping) -> 'Field':
+        return cls(name, field_def.get('type', ''), field_def)
+
+
+@dataclass(frozen=True, slots=True)
+class Model:
+    """A model with memoized plural name, primary key, relations, read-only fields, list fields and bulk options"""
+
+    name: str
+    fields: Tuple[Field, ...]
+    options: Mapping = field(default_factory=lambda: _EMPTY)
+    plural: str = field(init=False)
+    field_map: Mapping = field(init=False)
+    primary_key: Optional[Field] = field(init=False)
+    pk_name: str = field(init=False)
+    relations: Tuple[Field, ...] = field(init=False)
+    read_only_fields: Tuple[str, ...] = field(init=False)
+    list_fields: Tuple[str, ...] = field(init=False)
+    bulk: Optional[Mapping] = field(init=False)
+
+    def __post_init__(self):
+        primary_key = next((f for f in self.fields if f.primary_key), None)
+        object.__setattr__(self, 'plural', self.options.get('plural') or pluralize(self.name))
+        object.__setattr__(self, 'field_map', MappingProxyType({f.name: f for f in self.fields}))
+        object.__setattr__(self, 'primary_key', primary_key)
+        object.__setattr__(self, 'pk_name', primary_key.name if primary_key else 'id')
+        object.__setattr__(self, 'relations', tuple(f for f in self.fields if f.is_relation))
+        object.__setattr__(self, 'read_only_fields', tuple(f.name for f in self.fields if f.read_only))
+        object.__setattr__(self, 'list_fields', tuple(self.options.get('list_fields') or ()))
+        object.__setattr__(self, 'bulk', bulk_options(self.options.get('bulk')))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Read a raw model option (permissions, ordering, ...)"""
+        return self.options.get(key, default)
+
+    @classmethod
+    def from_spec(cls, name: str, model_def: Dict[str, Any]) -> 'Model':
+        return cls._from_frozen(name, freeze(model_def))
+
+    @classmethod
+    def _from_frozen(cls, name: str, model_def: Mapping) -> 'Model':
+        fields = tuple(
+            Field._from_frozen(field_name, field_def)
+            for field_name, field_def in model_def.get('fields', _EMPTY).items()
+        )
+        options = {key: value for key, value in model_def.items() if key != 'fields'}
+        return cls(name, fields, MappingProxyType(options))
+
+
+@dataclass(frozen=True, slots=True)
+class Endpoint:
+    """An API endpoint declared in the DSL"""
+
+    path: str
+    method: str
+    handler: str
+    options: Mapping = field(default_factory=lambda: _EMPTY)
+
+    @property
+    def auth_required(self) -> bool:
+        return bool(self.options.get('auth_required'))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.options.get(key, default)
+
+    @classmethod
+    def from_spec(cls, endpoint: Dict[str, Any]) -> 'Endpoint':
+        return cls._from_frozen(freeze(endpoint))
+
+    @classmethod
+    def _from_frozen(cls, endpoint: Mapping) -> 'Endpoint':
+        return cls(
+            endpoint.get('path', ''),
+            endpoint.get('method', 'GET').upper(),
+            endpoint.get('handler', ''),
+            endpoint
+        )
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Project(Mapping):
+    """Parsed project shared across generators
+
+    Also behaves as a read-only mapping over the normalized specification, so
+    code and templates written against the plain dict keep working.
+    """
+
+    name: str
+    models: Mapping
+    endpoints: Tuple[Endpoint, ...]
+    spec: Mapping
+    relations: RelationGraph
+    user_model: Optional[Model] = None
+
+    def __getitem__(self, key: str) -> Any:
+        return self.spec[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.spec)
+
+    def __len__(self) -> int:
+        return len(self.spec)
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Any], relations: Optional[RelationGraph] = None) -> 'Project':
+        """Build the IR from a normalized specification
+
+        ``relations`` lets the parser hand over the graph it already built
+        during validation instead of rescanning the models.
+        """
+        # Frozen once; models and endpoints share the frozen sections
+        frozen = freeze(spec)
+        models = {
+            model_name: Model._from_frozen(model_name, model_def)
+            for model_name, model_def in frozen.get('models', _EMPTY).items()
+        }
+        endpoints = tuple(
+            Endpoint._from_frozen(endpoint)
+            for endpoint in frozen.get('api', _EMPTY).get('endpoints', ())
+        )
+        user_model = models.get(frozen.get('auth', _EMPTY).get('user_model'))
+
+        return cls(
+            name=frozen.get('meta', _EMPTY).get('name', 'project'),
+            models=MappingProxyType(models),
+            endpoints=endpoints,
+            spec=frozen,
+            relations=relations or RelationGraph.from_models(frozen.get('models', _EMPTY)),
+            user_model=user_model
+        )
+
+    @classmethod
+    def coerce(cls, spec: Mapping) -> 'Project':
+        """Return ``spec`` if it already is a Project, otherwise build one"""
+        return spec if isinstance(spec, Project) else cls.from_spec(spec)
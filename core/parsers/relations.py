@@ -0,0 +1,180 @@
+"""
+Relationship Graph for InfraNest
+Indexes foreign key and many-to-many relations between DSL models
+"""
+
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Optional, Tuple
+
+RELATION_TYPES = ('foreign_key', 'many_to_many')
+
+
+@dataclass(frozen=True, slots=True)
+class Relation:
+    """A relation field from ``source`` to ``target``"""
+
+    source: str
+    field: str
+    target: Optional[str]
+    type: str
+    nullable: bool
+
+    @property
+    def required(self) -> bool:
+        """Whether the target row must exist before the source row is inserted"""
+        return self.type == 'foreign_key' and not self.nullable
+
+
+class RelationGraph:
+    """Forward/reverse relation index built once per specification
+
+    Lookups are dictionary hits; the topological order, dependency cycles and
+    dangling references are computed once at construction.
+    """
+
+    __slots__ = ('models', 'forward', 'reverse', 'dangling', 'topological_order', 'cycles')
+
+    def __init__(self, model_names: Tuple[str, ...], relations: List[Relation]):
+        forward: Dict[str, List[Relation]] = {name: [] for name in model_names}
+        reverse: Dict[str, List[Relation]] = {name: [] for name in model_names}
+        dangling = []
+
+        for relation in relations:
+            forward[relation.source].append(relation)
+            if relation.target in reverse:
+                reverse[relation.target].append(relation)
+            else:
+                dangling.append(relation)
+
+        self.models = model_names
+        self.forward = MappingProxyType({name: tuple(rels) for name, rels in forward.items()})
+        self.reverse = MappingProxyType({name: tuple(rels) for name, rels in reverse.items()})
+        self.dangling = tuple(dangling)
+        self.cycles = self._find_cycles()
+        self.topological_order = self._order()
+
+    @classmethod
+    def from_models(cls, models: Mapping) -> 'RelationGraph':
+        """Build the graph from the DSL ``models`` section"""
+        relations = []
+        for model_name, model_def in models.items():
+            fields = model_def.get('fields') if isinstance(model_def, Mapping) else None
+            if not isinstance(fields, Mapping):
+                continue
+            for field_name, field_def in fields.items():
+                if not isinstance(field_def, Mapping) or field_def.get('type') not in RELATION_TYPES:
+                    continue
+                relations.append(Relation(
+                    source=model_name,
+                    field=field_name,
+                    target=field_def.get('model'),
+                    type=field_def['type'],
+                    # YAML reads an unquoted `null:` key as None
+                    nullable=bool(field_def.get('null', field_def.get(None)))
+                ))
+        return cls(tuple(models), relations)
+
+    def relations_from(self, model_name: str) -> Tuple[Relation, ...]:
+        """Relations declared on ``model_name``"""
+        return self.forward.get(model_name, ())
+
+    def relations_to(self, model_name: str) -> Tuple[Relation, ...]:
+        """Relations from other models (or itself) pointing at ``model_name``"""
+        return self.reverse.get(model_name, ())
+
+    def dependencies(self, model_name: str, required_only: bool = False) -> Tuple[str, ...]:
+        """Distinct models ``model_name`` references, excluding itself"""
+        targets = []
+        for relation in self.forward.get(model_name, ()):
+            if relation.target in self.reverse and relation.target != model_name \
+                    and relation.target not in targets and (relation.required or not required_only):
+                targets.append(relation.target)
+        return tuple(targets)
+
+    def _order(self) -> Tuple[str, ...]:
+        """Order models so referenced models come first (for migrations and seed data)
+
+        All relations are honoured when possible. Optional relations (nullable
+        foreign keys, many-to-many) are dropped only to break cycles; models
+        left in a cycle of required foreign keys keep their declaration order.
+        """
+        for required_only in (False, True):
+            order = self._kahn(required_only)
+            if len(order) == len(self.models):
+                return order
+
+        remaining = tuple(name for name in self.models if name not in order)
+        return order + remaining
+
+    def _kahn(self, required_only: bool) -> Tuple[str, ...]:
+        pending = {name: set(self.dependencies(name, required_only)) for name in self.models}
+        order = []
+        ready = deque(name for name in self.models if not pending[name])
+
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for relation in self.reverse[name]:
+                source_deps = pending[relation.source]
+                if name in source_deps:
+                    source_deps.discard(name)
+                    if not source_deps:
+                        ready.append(relation.source)
+
+        return tuple(order)
+
+    def _find_cycles(self) -> Tuple[Tuple[str, ...], ...]:
+        """Cycles of required foreign keys (Tarjan's strongly connected components)"""
+        index_of: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack = set()
+        cycles = []
+
+        def required_targets(name: str) -> List[str]:
+            return [
+                relation.target for relation in self.forward[name]
+                if relation.required and relation.target in self.forward
+            ]
+
+        def visit(name: str):
+            index_of[name] = lowlink[name] = len(index_of)
+            stack.append(name)
+            on_stack.add(name)
+            work.append((name, iter(required_targets(name))))
+
+        # Iterative depth-first search, so long foreign key chains cannot hit the recursion limit
+        work: List[Tuple[str, Iterator[str]]] = []
+        for model_name in self.models:
+            if model_name in index_of:
+                continue
+            visit(model_name)
+            while work:
+                name, targets = work[-1]
+                for target in targets:
+                    if target not in index_of:
+                        visit(target)
+                        break
+                    if target in on_stack:
+                        lowlink[name] = min(lowlink[name], index_of[target])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[name])
+
+                    if lowlink[name] == index_of[name]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == name:
+                                break
+                        if len(component) > 1 or name in required_targets(name):
+                            cycles.append(tuple(reversed(component)))
+
+        return tuple(cycles)
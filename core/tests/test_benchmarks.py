@@ -0,0 +1,35 @@
+"""
+Tests for comparing benchmark runs against the baseline
+"""
+
+from benchmarks.bench_engine import compare
+
+
+def report(size='small', dimensions=None, **stages):
+    return {'results': {size: {
+        'dimensions': dimensions or {'models': 5},
+        'stages': {stage: {'min_s': seconds} for stage, seconds in stages.items()}
+    }}}
+
+
+def test_regressions_beyond_the_threshold():
+    baseline = report(validate=0.010, build_ir=0.010, render=0.001)
+    current = report(validate=0.020, build_ir=0.011, render=0.004)
+
+    regressions, missing = compare(current, baseline, threshold=0.25, noise_floor=0.005)
+
+    assert regressions == [('small', 'validate', 0.010, 0.020)]
+    assert missing == []
+
+
+def test_stages_without_a_baseline_entry_are_reported():
+    current = report(validate=0.010, build_ir=0.010)
+
+    _, missing = compare(current, report(validate=0.010), threshold=0.25, noise_floor=0.005)
+    assert missing == [('small', 'build_ir')]
+
+    _, missing = compare(current, report(dimensions={'models': 50}, validate=0.010, build_ir=0.010), 0.25, 0.005)
+    assert missing == [('small', 'validate'), ('small', 'build_ir')]
+
+    _, missing = compare(current, report('large', validate=0.010), 0.25, 0.005)
+    assert len(missing) == 2
@@ -0,0 +1,138 @@
+"""
+Tests for resource budgets: request size, specification limits, render deadline and output byte cap
+"""
+
+import time
+
+import pytest
+
+from app import app
+from benchmarks.synthetic import build_spec
+from generators.budget import (
+    OutputTooLarge,
+    RenderBudget,
+    RenderDeadlineExceeded,
+    current_budget
+)
+from parsers.dsl_parser import DSLBudgetError, DSLParser
+from infranest_dsl import MAX_BYTES
+
+
+def spec(**dimensions):
+    return build_spec(**{'models': 3, 'fields': 2, 'relations': 1, 'endpoints': 5, **dimensions})
+
+
+def test_spec_within_budget_parses():
+    project = DSLParser(limits={'models': 3, 'fields': 4, 'endpoints': 15}).parse_project(spec())
+
+    assert len(project.models) == 3
+
+
+@pytest.mark.parametrize('limits, message', [
+    ({'models': 2}, 'defines 3 models; the limit is 2'),
+    ({'fields': 3}, "'Model0001' defines 4 fields; the limit is 3"),
+    ({'endpoints': 14}, 'defines 15 endpoints; the limit is 14'),
+])
+def test_spec_over_budget_is_rejected(limits, message):
+    parser = DSLParser(limits=limits)
+
+    result = parser.validate(spec())
+    assert not result['valid']
+    assert any(message in error for error in result['errors'])
+
+    with pytest.raises(DSLBudgetError) as excinfo:
+        parser.parse(spec())
+    assert excinfo.value.status_code == 413
+
+
+def test_choice_and_default_depth_budgets():
+    dsl = spec()
+    fields = dsl['models']['Model0000']['fields']
+    fields['status'] = {'type': 'choice', 'choices': ['a', 'b', 'c']}
+    fields['settings'] = {'type': 'json', 'default': {'a': {'b': {'c': 1}}}}
+
+    errors = DSLParser(limits={'choices': 2, 'default_depth': 2}).validate(dsl)['errors']
+
+    assert errors == [
+        "Field 'status' in model 'Model0000' has 3 choices; the limit is 2",
+        "Default of field 'settings' in model 'Model0000' is nested deeper than 2 levels"
+    ]
+    assert DSLParser(limits={'choices': 3, 'default_depth': 3}).validate(dsl)['valid']
+
+
+def test_budgets_are_checked_before_validation():
+    dsl = spec()
+    del dsl['meta']
+
+    errors = DSLParser(limits={'models': 1}).validate(dsl)['errors']
+
+    assert errors == ['Specification defines 3 models; the limit is 1']
+
+
+def test_budget_is_current_only_inside_its_context():
+    assert current_budget() is None
+    with RenderBudget() as budget:
+        assert current_budget() is budget
+    assert current_budget() is None
+
+
+def test_deadline():
+    budget = RenderBudget(deadline=0.01)
+    budget.check()
+    time.sleep(0.02)
+
+    assert budget.remaining() == 0
+    with pytest.raises(RenderDeadlineExceeded) as excinfo:
+        budget.check()
+    assert excinfo.value.status_code == 422
+
+
+def test_deadline_cancels_rendering_part_way():
+    produced = []
+
+    def slow_chunks():
+        while True:
+            produced.append(1)
+            time.sleep(0.0001)
+            yield 'x'
+
+    with pytest.raises(RenderDeadlineExceeded):
+        RenderBudget(deadline=0.05).consume(slow_chunks())
+    assert len(produced) < 10000
+
+
+def test_byte_cap_cancels_rendering_part_way():
+    produced = []
+
+    def endless_chunks():
+        while True:
+            produced.append(1)
+            yield 'x' * 100
+
+    with pytest.raises(OutputTooLarge) as excinfo:
+        RenderBudget(max_bytes=10000).consume(endless_chunks())
+    assert excinfo.value.status_code == 413
+    assert len(produced) < 200
+
+
+def test_byte_cap_is_shared_across_files():
+    budget = RenderBudget(max_bytes=10)
+    assert budget.consume(iter(['12345'])) == '12345'
+    budget.charge('6789')
+
+    with pytest.raises(OutputTooLarge):
+        budget.charge('ab')
+
+
+def test_byte_cap_counts_encoded_bytes():
+    budget = RenderBudget(max_bytes=4)
+
+    with pytest.raises(OutputTooLarge):
+        budget.consume(iter(['ééé']))
+
+
+@pytest.mark.parametrize('content_type', ['application/json', 'application/x-yaml'])
+def test_request_body_size_limit(content_type):
+    response = app.test_client().post('/api/v1/validate-dsl', data=b' ' * (MAX_BYTES + 1), content_type=content_type)
+
+    assert response.status_code == 413
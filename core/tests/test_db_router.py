@@ -0,0 +1,110 @@
+"""
+Tests for the generated read-replica router, run against two SQLite databases
+"""
+
+import importlib.util
+import sys
+
+import pytest
+
+from generators.django_templates import DjangoTemplates
+from parsers.dsl_parser import DSLParser
+
+django = pytest.importorskip('django')
+
+
+@pytest.fixture(scope='module')
+def router(tmp_path_factory):
+    """The rendered db_router module, with Django configured for a primary and one replica"""
+    from django.conf import settings
+
+    directory = tmp_path_factory.mktemp('replicas')
+    project = DSLParser().parse_project({
+        'meta': {'name': 'shop', 'version': '1.0.0', 'framework': 'django'},
+        'models': {'Product': {'fields': {'name': {'type': 'string', 'max_length': 100}}}},
+        'deployment': {'docker': {'port': 8000}, 'database': {'replicas': 1}}
+    })
+    path = directory / 'db_router.py'
+    path.write_text(DjangoTemplates().render_file(project, 'db_router.py')['content'])
+
+    settings.configure(
+        INSTALLED_APPS=['django.contrib.contenttypes'],
+        DATABASES={
+            'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(directory / 'db.sqlite3')},
+            'replica_1': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(directory / 'replica.sqlite3')}
+        },
+        DATABASE_ROUTERS=['db_router.ReplicaRouter'],
+        DATABASE_REPLICAS={'replica_1': 1},
+        READ_YOUR_WRITES_SECONDS=5
+    )
+    spec = importlib.util.spec_from_file_location('db_router', path)
+    module = sys.modules['db_router'] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    django.setup()
+
+    from django.contrib.contenttypes.models import ContentType
+    from django.db import connections
+    for alias in ('default', 'replica_1'):
+        with connections[alias].schema_editor() as editor:
+            editor.create_model(ContentType)
+    # Only the replica has this row, so reads show which database served them
+    ContentType.objects.using('replica_1').create(app_label='replica', model='only')
+
+    yield module
+    module.reset_request()
+
+
+def read_from_replica():
+    from django.contrib.contenttypes.models import ContentType
+    return ContentType.objects.filter(app_label='replica').exists()
+
+
+def request(cookies=None):
+    from django.test import RequestFactory
+    request = RequestFactory().get('/')
+    request.COOKIES.update(cookies or {})
+    return request
+
+
+def response():
+    from django.http import HttpResponse
+    return HttpResponse()
+
+
+def test_reads_use_the_replica_until_the_request_writes(router):
+    from django.contrib.contenttypes.models import ContentType
+
+    router.reset_request()
+    router.start_request(request(), True)
+    assert read_from_replica()
+
+    ContentType.objects.create(app_label='primary', model='written')
+    assert not read_from_replica()
+
+    finished = router.finish_request(response())
+    assert router.PIN_COOKIE in finished.cookies
+    assert not read_from_replica()
+
+
+def test_pinned_clients_and_other_actions_read_the_primary(router):
+    router.reset_request()
+    router.start_request(request({router.PIN_COOKIE: '1'}), True)
+    assert not read_from_replica()
+    router.finish_request(response())
+
+    router.reset_request()
+    router.start_request(request(), False)
+    assert not read_from_replica()
+
+
+def test_rejected_request_does_not_inherit_a_stale_write(router):
+    from django.contrib.contenttypes.models import ContentType
+
+    # A write outside any request (e.g. a signal or a management task) leaves state behind
+    ContentType.objects.create(app_label='primary', model='stale')
+
+    # ReplicaReadMixin: reset, then authentication rejects the request before start_request()
+    router.reset_request()
+    finished = router.finish_request(response())
+
+    assert router.PIN_COOKIE not in finished.cookies
@@ -0,0 +1,117 @@
+"""
+Tests for template rendering from the IR
+"""
+
+import json
+
+import pytest
+
+from generators.django_templates import DjangoTemplates
+from generators.loadtest_generator import LoadTestGenerator
+from parsers.dsl_parser import DSLParser
+
+
+def shop(**sections):
+    return {
+        'meta': {'name': 'shop', 'version': '1.0.0', 'framework': 'django'},
+        'auth': {'provider': 'jwt'},
+        'models': {
+            'Product': {
+                'fields': {
+                    'name': {'type': 'string', 'max_length': 100},
+                    'size': {'type': 'choice', 'choices': {'s': 'Small', 'l': 'Large'}}
+                },
+                'extra_kwargs': {'name': {'required': False}}
+            }
+        },
+        'api': {
+            'base_path': '/api/v1',
+            'endpoints': [{'path': '/products', 'method': 'GET', 'handler': 'products.list'}]
+        },
+        **sections
+    }
+
+
+@pytest.fixture
+def project():
+    return DSLParser().parse_project(shop())
+
+
+def test_nested_options_render_as_json(project):
+    # Nested sections of the IR are read-only mappings, which json cannot encode natively
+    renderer = DjangoTemplates()
+    serializers = renderer.render('serializers.py.j2', renderer.context(project))
+
+    assert 'extra_kwargs = {"name": {"required": false}}' in serializers
+
+
+def test_loadtest_scenario_with_mapping_choices(project):
+    files = LoadTestGenerator().generate(project)
+
+    scenario = json.loads(files['loadtest/scenario.json'])
+    product = next(model for model in scenario['seed']['models'] if model['model'] == 'Product')
+    assert product['fields']['size']['choices'] == {'s': 'Small', 'l': 'Large'}
+
+
+def test_optional_files_follow_the_deployment():
+    optional = {'pgbouncer.ini', 'db_router.py', 'metrics.py'}
+    templates = DjangoTemplates()
+    docker = {'port': 8000}
+
+    project = DSLParser().parse_project(shop(deployment={'docker': docker}))
+    assert not optional & set(templates.generate(project))
+    assert not optional & {entry['path'] for entry in templates.manifest(project)}
+
+    project = DSLParser().parse_project(shop(deployment={
+        'docker': docker,
+        'database': {'engine': 'postgresql', 'pgbouncer': True, 'replicas': 1},
+        'monitoring': {'metrics': True}
+    }))
+    files = templates.generate(project)
+    assert optional <= set(files)
+    assert all(files[path].strip() for path in optional)
+
+
+@pytest.mark.parametrize('server', ['gunicorn', 'uwsgi'])
+def test_metrics_use_a_multiprocess_directory(server):
+    project = DSLParser().parse_project(shop(deployment={
+        'docker': {'port': 8000},
+        'wsgi_server': server,
+        'monitoring': {'metrics': True}
+    }))
+    files = DjangoTemplates().generate(project)
+
+    assert 'PROMETHEUS_MULTIPROC_DIR' in files['Dockerfile' if server == 'uwsgi' else 'gunicorn.conf.py']
+
+
+def test_preview_defaults_to_the_emitted_files(project):
+    templates = DjangoTemplates()
+
+    files = templates.preview(project)['files']
+
+    assert [entry['path'] for entry in files] == list(templates.file_templates(project))
+    assert {'path': 'models.py', 'type': 'python'} in files
+
+
+def test_plural_names_the_url_collection():
+    spec = shop()
+    spec['models']['Category'] = {'plural': 'categories', 'fields': {'name': {'type': 'string', 'max_length': 50}}}
+    project = DSLParser().parse_project(spec)
+
+    urls = DjangoTemplates().render('urls.py.j2', DjangoTemplates().context(project))
+    assert "router.register(r'categories', CategoryViewSet)" in urls
+    assert "router.register(r'products', ProductViewSet)" in urls
+
+
+@pytest.mark.parametrize('plural, message', [
+    ('Categories!', 'plural must contain only lowercase letters'),
+    (['categories'], 'plural must contain only lowercase letters'),
+    ('products', "Models 'Product' and 'Category' share the URL collection 'products'"),
+])
+def test_invalid_plural_is_rejected(plural, message):
+    spec = shop()
+    spec['models']['Category'] = {'plural': plural, 'fields': {'name': {'type': 'string', 'max_length': 50}}}
+
+    errors = DSLParser().validate(spec)['errors']
+
+    assert any(message in error for error in errors)
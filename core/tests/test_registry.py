@@ -0,0 +1,58 @@
+"""
+Tests for the generator registry and how the API reports missing generators
+"""
+
+import json
+
+import pytest
+
+from app import app
+from generators.registry import GeneratorRegistry, GeneratorUnavailable, UnknownFramework
+
+
+@pytest.fixture
+def registry(tmp_path):
+    manifest = tmp_path / 'manifest.json'
+    manifest.write_text(json.dumps({'generators': [
+        {'id': 'loadtest', 'name': 'Load test', 'entry': 'generators.loadtest_generator:LoadTestGenerator'},
+        {'id': 'missing', 'name': 'Missing', 'entry': 'generators.missing_generator:MissingGenerator'}
+    ]}))
+    return GeneratorRegistry(manifest, entry_point_group=None)
+
+
+def test_metadata_marks_unimportable_generators(registry):
+    metadata = {entry['id']: entry for entry in registry.metadata()}
+
+    assert metadata['loadtest']['available'] is True
+    assert metadata['missing']['available'] is False
+    assert registry.loaded() == []
+
+
+def test_unavailable_and_unknown_frameworks(registry):
+    assert registry.get('loadtest') is registry.get('loadtest')
+
+    with pytest.raises(GeneratorUnavailable) as excinfo:
+        registry.get('missing')
+    assert excinfo.value.status_code == 503
+
+    with pytest.raises(UnknownFramework) as excinfo:
+        registry.get('flask')
+    assert excinfo.value.status_code == 400
+
+
+def test_api_reports_missing_generator():
+    client = app.test_client()
+    frameworks = client.get('/api/v1/frameworks').get_json()['frameworks']
+    unavailable = [entry['id'] for entry in frameworks if not entry['available']]
+    if not unavailable:
+        pytest.skip('every bundled generator is installed')
+
+    spec = {
+        'meta': {'name': 'shop', 'version': '1.0.0', 'framework': unavailable[0]},
+        'models': {'Product': {'fields': {'name': {'type': 'string', 'max_length': 100}}}}
+    }
+    for endpoint in ('/api/v1/generate-code', '/api/v1/preview-code'):
+        response = client.post(endpoint, json={'dsl': spec})
+
+        assert response.status_code == 503
+        assert 'could not be loaded' in response.get_json()['error']
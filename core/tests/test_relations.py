@@ -0,0 +1,104 @@
+"""
+Tests for the relation graph: ordering, cycles and dangling references
+"""
+
+from parsers.dsl_parser import DSLParser
+from parsers.relations import RelationGraph
+
+
+def fk(model, null=False):
+    return {'type': 'foreign_key', 'model': model, 'null': null}
+
+
+def m2m(model):
+    return {'type': 'many_to_many', 'model': model}
+
+
+def graph(**models):
+    """Graph over models given as ``name={field_name: field_def}``"""
+    return RelationGraph.from_models({name: {'fields': fields} for name, fields in models.items()})
+
+
+def test_referenced_models_come_first():
+    relations = graph(Comment={'post': fk('Post'), 'author': fk('User')}, Post={'author': fk('User')}, User={})
+
+    order = relations.topological_order
+    assert order.index('User') < order.index('Post') < order.index('Comment')
+    assert relations.cycles == ()
+    assert relations.dangling == ()
+
+
+def test_independent_models_keep_declaration_order():
+    relations = graph(Tag={}, Category={}, Author={})
+
+    assert relations.topological_order == ('Tag', 'Category', 'Author')
+
+
+def test_reverse_index_and_dependencies():
+    relations = graph(Post={'author': fk('User'), 'tags': m2m('Tag')}, User={}, Tag={})
+
+    assert [r.source for r in relations.relations_to('User')] == ['Post']
+    assert relations.dependencies('Post') == ('User', 'Tag')
+    assert relations.dependencies('Post', required_only=True) == ('User',)
+
+
+def test_optional_relations_are_dropped_to_break_cycles():
+    relations = graph(Team={'captain': fk('Player', null=True)}, Player={'team': fk('Team')})
+
+    assert relations.cycles == ()
+    assert relations.topological_order == ('Team', 'Player')
+
+
+def test_required_foreign_key_cycle_is_reported():
+    relations = graph(A={'b': fk('B')}, B={'c': fk('C')}, C={'a': fk('A')}, D={'a': fk('A')})
+
+    assert relations.cycles == (('A', 'B', 'C'),)
+    # Every model is still ordered; the cycle keeps its declaration order
+    assert sorted(relations.topological_order) == ['A', 'B', 'C', 'D']
+
+
+def test_self_reference_is_a_cycle_only_when_required():
+    assert graph(Node={'parent': fk('Node')}).cycles == (('Node',),)
+    assert graph(Node={'parent': fk('Node', null=True)}).cycles == ()
+
+
+def test_yaml_null_key_marks_relation_optional():
+    # An unquoted `null: true` is read by YAML as the key None
+    relations = graph(Node={'parent': {'type': 'foreign_key', 'model': 'Node', None: True}})
+
+    assert relations.cycles == ()
+
+
+def test_long_chain_does_not_hit_the_recursion_limit():
+    names = [f'M{index}' for index in range(5000)]
+    models = {name: {'fields': {'next': fk(names[index + 1])}} for index, name in enumerate(names[:-1])}
+    models[names[-1]] = {'fields': {'first': fk(names[0])}}
+
+    relations = RelationGraph.from_models(models)
+
+    assert len(relations.cycles) == 1
+    assert len(relations.cycles[0]) == 5000
+
+
+def test_dangling_references():
+    relations = graph(Post={'author': fk('Writer'), 'owner': {'type': 'foreign_key'}}, User={})
+
+    assert [(r.field, r.target) for r in relations.dangling] == [('author', 'Writer'), ('owner', None)]
+    assert relations.dependencies('Post') == ()
+    assert relations.topological_order == ('Post', 'User')
+
+
+def test_parser_reports_dangling_references_and_warns_about_cycles():
+    spec = {
+        'meta': {'name': 'shop', 'version': '1.0.0', 'framework': 'django'},
+        'models': {
+            'Order': {'fields': {'customer': fk('Customer'), 'invoice': fk('Invoice')}},
+            'Invoice': {'fields': {'order': fk('Order')}}
+        }
+    }
+
+    result = DSLParser().validate(spec)
+
+    assert not result['valid']
+    assert "Field 'customer' in model 'Order' references unknown model 'Customer'" in result['errors']
+    assert any('Order -> Invoice -> Order' in warning for warning in result['warnings'])
@@ -0,0 +1,90 @@
+"""
+Tests for bounded YAML loading: size, depth, document and alias limits
+"""
+
+import pytest
+
+from infranest_dsl import (
+    DSLLoadError,
+    DSLTooLargeError,
+    check_size,
+    check_structure,
+    load_dsl,
+    load_dsl_documents,
+    load_dsl_file,
+    load_dsl_file_documents
+)
+
+
+def nested(depth):
+    """A YAML mapping nested ``depth`` levels deep"""
+    lines = [f"{'  ' * level}level{level}:" for level in range(depth)]
+    return '\n'.join(lines) + ' leaf\n'
+
+
+def test_loads_documents():
+    documents = load_dsl_documents(b"meta: {name: one}\n---\nmeta: {name: two}\n")
+
+    assert [document['meta']['name'] for document in documents] == ['one', 'two']
+
+
+def test_single_document_loader_rejects_streams():
+    with pytest.raises(DSLLoadError, match='Expected one DSL document'):
+        load_dsl("a: 1\n---\nb: 2\n")
+
+
+def test_size_limit():
+    check_size(10, max_bytes=10)
+    with pytest.raises(DSLTooLargeError) as excinfo:
+        check_size(11, max_bytes=10)
+    assert excinfo.value.status_code == 413
+
+    with pytest.raises(DSLTooLargeError):
+        load_dsl_documents("a: " + "x" * 100, max_bytes=50)
+
+
+def test_file_size_checked_before_reading(tmp_path):
+    path = tmp_path / 'big.yml'
+    path.write_text("a: " + "x" * 100)
+
+    with pytest.raises(DSLTooLargeError):
+        load_dsl_file(path, max_bytes=50)
+
+
+def test_single_document_file_loader_rejects_streams(tmp_path):
+    path = tmp_path / 'specs.yml'
+    path.write_text("meta: {name: one}\n---\nmeta: {name: two}\n")
+
+    assert len(load_dsl_file_documents(path)) == 2
+    with pytest.raises(DSLLoadError, match='Expected one DSL document'):
+        load_dsl_file(path)
+
+
+def test_depth_limit():
+    check_structure(nested(4), max_depth=4)
+    with pytest.raises(DSLLoadError, match='maximum depth of 4'):
+        check_structure(nested(5), max_depth=4)
+
+
+def test_document_limit():
+    stream = "---\na: 1\n" * 3
+    check_structure(stream, max_documents=3)
+    with pytest.raises(DSLLoadError, match='maximum of 2 documents'):
+        check_structure(stream, max_documents=2)
+
+
+def test_alias_limit():
+    # Each level references the previous one twice ("billion laughs")
+    stream = "a: &a [x, x]\nb: &b [*a, *a]\nc: &c [*b, *b]\n"
+    check_structure(stream, max_aliases=4)
+    with pytest.raises(DSLLoadError, match='more than 3 YAML aliases'):
+        check_structure(stream, max_aliases=3)
+
+
+def test_invalid_and_empty_input():
+    with pytest.raises(DSLLoadError, match='Invalid YAML'):
+        load_dsl_documents("a: [1, 2\n")
+    with pytest.raises(DSLLoadError, match='empty'):
+        load_dsl_documents("# only a comment\n")
+    with pytest.raises(DSLLoadError, match='must be a mapping'):
+        load_dsl_documents("- a\n- b\n")
@@ -0,0 +1,21 @@
+"""
+InfraNest DSL
+Loading of DSL specifications shared by the core API and the copilot CLI
+"""
+
+from .yaml_loader import (
+    LIBYAML,
+    MAX_ALIASES,
+    MAX_BYTES,
+    MAX_DEPTH,
+    MAX_DOCUMENTS,
+    YAML_MIMETYPES,
+    DSLLoadError,
+    DSLTooLargeError,
+    check_size,
+    check_structure,
+    load_dsl,
+    load_dsl_documents,
+    load_dsl_file,
+    load_dsl_file_documents
+)
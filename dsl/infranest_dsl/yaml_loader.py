@@ -0,0 +1,116 @@
+"""
+YAML Loader for InfraNest
+Fast, bounded loading of raw DSL YAML shared by the core API and the copilot CLI
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Any, List, Union
+
+import yaml
+
+try:
+    # libyaml-backed loader; several times faster than the pure-Python one
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+LIBYAML = SafeLoader.__name__ == 'CSafeLoader'
+
+MAX_BYTES = int(os.environ.get('INFRANEST_DSL_MAX_BYTES', 2 * 1024 * 1024))
+MAX_DEPTH = int(os.environ.get('INFRANEST_DSL_MAX_DEPTH', 32))
+MAX_DOCUMENTS = int(os.environ.get('INFRANEST_DSL_MAX_DOCUMENTS', 20))
+MAX_ALIASES = int(os.environ.get('INFRANEST_DSL_MAX_ALIASES', 100))
+
+YAML_MIMETYPES = ('application/x-yaml', 'application/yaml', 'text/yaml', 'text/x-yaml')
+
+
+class DSLLoadError(ValueError):
+    """Raised when raw DSL input cannot be loaded"""
+
+    status_code = 400
+
+
+class DSLTooLargeError(DSLLoadError):
+    """Raised when raw DSL input exceeds the size limit"""
+
+    status_code = 413
+
+
+def check_size(size: int, max_bytes: int = MAX_BYTES):
+    """Reject input larger than ``max_bytes`` before reading or parsing it"""
+    if size > max_bytes:
+        raise DSLTooLargeError(f"DSL input is {size} bytes; the limit is {max_bytes} bytes")
+
+
+def check_structure(data: Union[str, bytes], max_depth: int = MAX_DEPTH,
+                    max_documents: int = MAX_DOCUMENTS, max_aliases: int = MAX_ALIASES):
+    """Scan the event stream and enforce nesting, document and alias limits
+
+    Events are cheap to produce and hold no constructed objects, so abusive
+    input is rejected before any Python structures are built.
+    """
+    depth = 0
+    documents = 0
+    aliases = 0
+
+    try:
+        for event in yaml.parse(data, Loader=SafeLoader):
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                depth += 1
+                if depth > max_depth:
+                    raise DSLLoadError(f"DSL nesting exceeds the maximum depth of {max_depth}")
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+            elif isinstance(event, yaml.DocumentStartEvent):
+                documents += 1
+                if documents > max_documents:
+                    raise DSLLoadError(f"DSL stream exceeds the maximum of {max_documents} documents")
+            elif isinstance(event, yaml.AliasEvent):
+                aliases += 1
+                if aliases > max_aliases:
+                    raise DSLLoadError(f"DSL uses more than {max_aliases} YAML aliases")
+    except yaml.YAMLError as e:
+        raise DSLLoadError(f"Invalid YAML: {e}") from e
+
+
+def load_dsl_documents(data: Union[str, bytes], max_bytes: int = MAX_BYTES) -> List[Dict[str, Any]]:
+    """Load every document of a (possibly multi-document) YAML stream"""
+    check_size(len(data), max_bytes)
+    check_structure(data)
+
+    try:
+        documents = [doc for doc in yaml.load_all(data, Loader=SafeLoader) if doc is not None]
+    except yaml.YAMLError as e:
+        raise DSLLoadError(f"Invalid YAML: {e}") from e
+
+    if not documents:
+        raise DSLLoadError("DSL input is empty")
+    for index, document in enumerate(documents):
+        if not isinstance(document, dict):
+            raise DSLLoadError(f"DSL document {index + 1} must be a mapping")
+
+    return documents
+
+
+def load_dsl(data: Union[str, bytes], max_bytes: int = MAX_BYTES) -> Dict[str, Any]:
+    """Load a single-document DSL specification"""
+    documents = load_dsl_documents(data, max_bytes)
+    if len(documents) > 1:
+        raise DSLLoadError(f"Expected one DSL document, found {len(documents)}")
+    return documents[0]
+
+
+def load_dsl_file_documents(path: Union[str, Path], max_bytes: int = MAX_BYTES) -> List[Dict[str, Any]]:
+    """Load all DSL documents from a file, checking its size before reading"""
+    path = Path(path)
+    check_size(path.stat().st_size, max_bytes)
+    return load_dsl_documents(path.read_bytes(), max_bytes)
+
+
+def load_dsl_file(path: Union[str, Path], max_bytes: int = MAX_BYTES) -> Dict[str, Any]:
+    """Load a single-document DSL file, checking its size before reading"""
+    documents = load_dsl_file_documents(path, max_bytes)
+    if len(documents) > 1:
+        raise DSLLoadError(f"Expected one DSL document in {path}, found {len(documents)}")
+    return documents[0]
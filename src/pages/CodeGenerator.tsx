@@ -204,12 +204,13 @@ const CodeGenerator: React.FC = () => {
               <button
                 key={framework.id}
                 onClick={() => setSelectedFramework(framework.id)}
-                disabled={isGenerating}
+                disabled={isGenerating || framework.available === false}
+                title={framework.available === false ? 'Generator not installed on this server' : undefined}
                 className={`p-6 rounded-lg border transition-all text-left ${
                   selectedFramework === framework.id
                     ? 'bg-[#00ff88]/10 border-[#00ff88] text-[#00ff88]'
                     : 'bg-[#1a1a1a] border-[#333333] text-gray-300 hover:bg-[#222222] hover:border-[#444444]'
-                } ${isGenerating ? 'opacity-50 cursor-not-allowed' : ''}`}
+                } ${isGenerating || framework.available === false ? 'opacity-50 cursor-not-allowed' : ''}`}
               >
                 <div className="space-y-3">
                   <div>